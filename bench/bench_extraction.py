@@ -0,0 +1,177 @@
+"""
+Extraction benchmark driven by saved HTML pages.
+
+Replays a fixture corpus through extraction.py and reports, per page and per
+layout: pages/sec, per-result latency, peak memory and how many fields were
+extracted. Compares against bench/baseline.json and exits non-zero when
+throughput or extracted fields regress.
+
+    python bench/bench_extraction.py                     # default corpus
+    python bench/bench_extraction.py pages/*.html --parser html.parser
+    python bench/bench_extraction.py --update-baseline   # after an intended change
+
+Throughput numbers are machine specific: regenerate the baseline on the host
+you compare on.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+from extraction import (  # noqa: E402
+    DEFAULT_PARSER, LAYOUT_ORDER, PARSER_BACKENDS, Profile,
+    extract_profile, find_result_containers, make_soup, read_page,
+)
+
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+DEFAULT_CORPUS = [
+    os.path.join(REPO_DIR, "debug_page_source.html"),
+    os.path.join(REPO_DIR, "debug_extraction_fail.html"),
+]
+
+# A field counts as extracted when it differs from the Profile default
+FIELDS = ("name", "url", "headline", "location")
+EMPTY = Profile()
+
+
+def default_corpus():
+    pages = [p for p in DEFAULT_CORPUS if os.path.exists(p)]
+    pages += sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")) + glob.glob(os.path.join(FIXTURE_DIR, "*.html.gz")))
+    return pages
+
+
+def count_fields(profiles):
+    return sum(1 for p in profiles for f in FIELDS if getattr(p, f) != getattr(EMPTY, f))
+
+
+def parse_page(html, parser):
+    """One full pass: parse, find containers, extract every container"""
+    soup = make_soup(html, parser, search_page=True)
+    layout, results = find_result_containers(soup)
+    profiles = [extract_profile(r, layout) for r in results]
+    return layout, results, [p for p in profiles if p]
+
+
+def bench_page(path, parser, repeat):
+    html = read_page(path)
+
+    layout, results, profiles = parse_page(html, parser)
+
+    # Timing: whole-page throughput, and extraction alone for per-result latency
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse_page(html, parser)
+    page_seconds = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for r in results:
+            extract_profile(r, layout)
+    extract_seconds = (time.perf_counter() - start) / repeat
+
+    # Memory in a separate pass, tracemalloc skews timings
+    tracemalloc.start()
+    parse_page(html, parser)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "page": os.path.relpath(path, REPO_DIR),
+        "layout": layout,
+        "containers": len(results),
+        "records": len(profiles),
+        "fields": count_fields(profiles),
+        "pages_per_sec": 1 / page_seconds if page_seconds else 0.0,
+        "ms_per_result": extract_seconds * 1000 / len(results) if results else 0.0,
+        "peak_kb": peak / 1024,
+    }
+
+
+def print_report(rows, parser):
+    print(f"Parser backend: {parser}")
+    print(f"{'page':<40} {'layout':<10} {'found':>5} {'recs':>5} {'fields':>6} {'pages/s':>8} {'ms/res':>7} {'peak KB':>8}")
+    for r in rows:
+        print(f"{r['page'][:40]:<40} {r['layout']:<10} {r['containers']:>5} {r['records']:>5} {r['fields']:>6} "
+              f"{r['pages_per_sec']:>8.1f} {r['ms_per_result']:>7.3f} {r['peak_kb']:>8.0f}")
+
+    print("\nPer layout (fields extracted / fields possible):")
+    for layout in LAYOUT_ORDER:
+        layout_rows = [r for r in rows if r["layout"] == layout and r["containers"]]
+        if not layout_rows:
+            print(f"  {layout:<10} no fixtures")
+            continue
+        fields = sum(r["fields"] for r in layout_rows)
+        possible = sum(r["containers"] for r in layout_rows) * len(FIELDS)
+        pages_per_sec = len(layout_rows) / sum(1 / r["pages_per_sec"] for r in layout_rows)
+        print(f"  {layout:<10} {fields}/{possible} ({fields / possible:.0%}), {pages_per_sec:.1f} pages/s")
+
+
+def check_regressions(rows, baseline, tolerance):
+    """Return a list of regression messages against the baseline"""
+    failures = []
+    for r in rows:
+        base = baseline.get(r["page"])
+        if not base:
+            continue
+        if r["fields"] < base["fields"]:
+            failures.append(f"{r['page']}: fields extracted dropped {base['fields']} -> {r['fields']}")
+        if r["records"] < base["records"]:
+            failures.append(f"{r['page']}: records dropped {base['records']} -> {r['records']}")
+        floor = base["pages_per_sec"] * (1 - tolerance)
+        if r["pages_per_sec"] < floor:
+            failures.append(f"{r['page']}: throughput {r['pages_per_sec']:.1f} pages/s below {floor:.1f} "
+                            f"(baseline {base['pages_per_sec']:.1f})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extraction against saved HTML pages")
+    parser.add_argument("pages", nargs="*", help="HTML pages to replay, .html.gz debug captures included (default: debug pages + bench/fixtures)")
+    parser.add_argument("--parser", choices=list(PARSER_BACKENDS), default=DEFAULT_PARSER, help="Parser backend")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed iterations per page")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed throughput drop vs baseline (0.25 = 25%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results to bench/baseline.json")
+    args = parser.parse_args()
+
+    pages = args.pages or default_corpus()
+    if not pages:
+        print("No pages to benchmark.")
+        return 1
+
+    rows = [bench_page(path, args.parser, args.repeat) for path in pages]
+    print_report(rows, args.parser)
+
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    if args.update_baseline:
+        for r in rows:
+            baseline[r["page"]] = {k: r[k] for k in ("layout", "records", "fields")}
+            baseline[r["page"]]["pages_per_sec"] = round(r["pages_per_sec"], 1)
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {os.path.relpath(BASELINE_FILE, REPO_DIR)}")
+        return 0
+
+    failures = check_regressions(rows, baseline, args.tolerance)
+    if failures:
+        print("\nREGRESSIONS:")
+        for msg in failures:
+            print(f"  {msg}")
+        return 1
+    print("\nNo regressions against baseline." if baseline else "\nNo baseline yet (run with --update-baseline).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Page-load benchmark: load time and bytes transferred per browser mode.
+
+Loads the same pages in a fresh Chrome per mode (default: headed, nothing
+blocked; lightweight: headless and images/fonts/media blocked) with the HTTP
+cache disabled, and reports p50/p95 load time and median bytes per mode.
+Bytes come from Chrome's performance log, so cross-origin responses count too.
+
+    python bench/bench_page_weight.py https://www.linkedin.com/in/someone/ --chrome-profile chrome-profile
+    python bench/bench_page_weight.py --replay replay/ /search/results/people/?keywords=x /in/jane-doe/
+    python bench/bench_page_weight.py URL... --modes default,headless,lightweight --repeat 5
+
+Real LinkedIn pages need a logged-in session: pass the persistent Chrome
+profile (LINKEDIN_CHROME_PROFILE) the bot already uses.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+from selenium import webdriver  # noqa: E402
+from selenium.webdriver.chrome.options import Options  # noqa: E402
+from selenium.webdriver.chrome.service import Service  # noqa: E402
+
+import page_weight  # noqa: E402
+from driver_cache import resolve_driver_path  # noqa: E402
+from instrumentation import percentile  # noqa: E402
+from replay_server import start_replay_server  # noqa: E402
+
+# mode -> (headless, blocked resource types)
+MODES = {
+    "default": (False, ()),
+    "headless": (True, ()),
+    "blocked": (False, page_weight.LIGHTWEIGHT_BLOCK),
+    "lightweight": (True, page_weight.LIGHTWEIGHT_BLOCK),
+}
+
+
+def start_browser(mode, chrome_profile=None):
+    headless, block = MODES[mode]
+    options = Options()
+    page_weight.configure_options(options, headless, block)
+    if chrome_profile:
+        options.add_argument(f"--user-data-dir={os.path.abspath(chrome_profile)}")
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    driver_path, _ = resolve_driver_path(os.path.join(REPO_DIR, ".driver_cache.json"))
+    driver = webdriver.Chrome(service=Service(driver_path), options=options)
+    page_weight.install(driver, block)
+    driver.execute_cdp_cmd("Network.enable", {})
+    # Every load is a cold load, as for a profile the bot has not visited
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+    return driver
+
+
+def wire_bytes(driver):
+    """Bytes received since the previous call, for every origin (drains the performance log)"""
+    total = 0
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        if message["method"] == "Network.loadingFinished":
+            total += message["params"]["encodedDataLength"]
+    return total
+
+
+def bench_mode(mode, urls, repeat, chrome_profile=None):
+    driver = start_browser(mode, chrome_profile)
+    samples = []
+    try:
+        for _ in range(repeat):
+            for url in urls:
+                wire_bytes(driver)
+                start = time.perf_counter()
+                driver.get(url)
+                wall = time.perf_counter() - start
+                weight = page_weight.page_weight(driver)
+                samples.append({
+                    "url": url,
+                    "wall_ms": wall * 1000,
+                    "load_ms": weight["load_ms"] or 0,
+                    "bytes": wire_bytes(driver),
+                    "resources": weight["resources"],
+                })
+    finally:
+        driver.quit()
+    return samples
+
+
+def summarize(mode, samples):
+    load = sorted(s["load_ms"] for s in samples)
+    return {
+        "mode": mode,
+        "loads": len(samples),
+        "load_p50": percentile(load, 50),
+        "load_p95": percentile(load, 95),
+        "wall_p50": percentile(sorted(s["wall_ms"] for s in samples), 50),
+        "kb_median": statistics.median(s["bytes"] for s in samples) / 1024,
+        "resources_median": statistics.median(s["resources"] for s in samples),
+    }
+
+
+def print_report(rows):
+    print(f"{'mode':<12} {'loads':>5} {'load p50':>9} {'load p95':>9} {'get() p50':>10} {'KB med':>9} {'res med':>8}")
+    for r in rows:
+        print(f"{r['mode']:<12} {r['loads']:>5} {r['load_p50']:>7.0f}ms {r['load_p95']:>7.0f}ms "
+              f"{r['wall_p50']:>8.0f}ms {r['kb_median']:>9.0f} {r['resources_median']:>8.0f}")
+    base = rows[0]
+    for r in rows[1:]:
+        if base["load_p50"] and base["kb_median"]:
+            print(f"{r['mode']} vs {base['mode']}: load p50 {r['load_p50'] / base['load_p50'] - 1:+.0%}, "
+                  f"bytes {r['kb_median'] / base['kb_median'] - 1:+.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare page load time and bytes per browser mode")
+    parser.add_argument("urls", nargs="+", help="Pages to load (paths when --replay is used)")
+    parser.add_argument("--modes", default="default,lightweight",
+                        help=f"Comma separated, first is the reference: {', '.join(MODES)}")
+    parser.add_argument("--repeat", type=int, default=3, help="Loads per page and mode")
+    parser.add_argument("--chrome-profile", help="Chrome user data dir with a logged-in LinkedIn session")
+    parser.add_argument("--replay", metavar="DIR", help="Serve captured pages from DIR (see replay_server.py)")
+    args = parser.parse_args()
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        print(f"Unknown mode(s): {', '.join(unknown)}. Choose from: {', '.join(MODES)}")
+        return 1
+
+    urls = args.urls
+    replay = None
+    if args.replay:
+        replay = start_replay_server(args.replay)
+        urls = [replay.base_url + "/" + url.lstrip("/") for url in urls]
+
+    try:
+        rows = [summarize(mode, bench_mode(mode, urls, args.repeat, args.chrome_profile)) for mode in modes]
+    finally:
+        if replay:
+            replay.shutdown()
+    print_report(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Logging setup for the bot.
+
+Log calls only enqueue the record (QueueHandler); a background QueueListener
+thread formats and writes it, so slow terminals or files never block the
+browser loop. Per-item messages are logged at DEBUG with lazy %-style
+arguments, so at the default INFO level they cost one level check.
+
+    LINKEDIN_LOG_LEVEL=DEBUG      full per-item traces
+    LINKEDIN_LOG_FORMAT=json      one JSON object per line
+    LINKEDIN_LOG_FILE=bot.log     also write to a file
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+LOGGER_NAME = "linkedin_bot"
+TEXT_FORMAT = "%(asctime)s %(levelname)-7s %(message)s"
+
+# LogRecord attributes that are not user-supplied `extra` fields
+RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener = None
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue the record as-is; message formatting happens on the listener thread"""
+    def prepare(self, record):
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        event = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in RESERVED_ATTRS:
+                event[key] = value
+        if record.exc_info:
+            event["exc"] = self.formatException(record.exc_info)
+        return json.dumps(event, default=str)
+
+
+def get_logger(name=None):
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+def stop_logging():
+    """Drain the queue and stop the listener thread"""
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
+def setup_logging(level=None, fmt=None, log_file=None):
+    """Route the bot's loggers through a queue to stdout (and optionally a file)"""
+    global _listener
+    level = (level or os.getenv("LINKEDIN_LOG_LEVEL", "INFO")).upper()
+    fmt = fmt or os.getenv("LINKEDIN_LOG_FORMAT", "text")
+    log_file = log_file or os.getenv("LINKEDIN_LOG_FILE")
+
+    stop_logging()
+
+    formatter = JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT, "%H:%M:%S")
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    logger = get_logger()
+    logger.handlers[:] = [DeferredQueueHandler(log_queue)]
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
@@ -0,0 +1,119 @@
+"""
+In-browser extraction of search result pages.
+
+Runs the same container classification and field rules as extraction.py inside
+the page with a single execute_script call and returns only compact records,
+instead of shipping the whole serialized DOM (page_source) over WebDriver and
+re-parsing it in Python. The marker lists are passed in from extraction.py so
+both paths share one definition.
+"""
+from extraction import (
+    HEADLINE_CLASS_MARKERS, LOCATION_CLASS_MARKERS, PROFILE_HREF_MARKERS,
+    Profile, normalize_profile_url,
+)
+
+EXTRACT_SCRIPT = """
+const [hrefMarkers, headlineMarkers, locationMarkers, knownLayout] = arguments;
+const hasMarker = (s, markers) => markers.some(m => s.includes(m));
+const ANONYMIZED = {'person-name': 'name', 'title': 'headline', 'location': 'location'};
+const SKIP = new Set(['SCRIPT', 'STYLE', 'TEMPLATE', 'NOSCRIPT']);
+
+// Stripped text nodes in document order (like BeautifulSoup's stripped_strings)
+function strings(el, limit) {
+    const out = [];
+    const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT, {
+        acceptNode: n => SKIP.has(n.parentNode.nodeName) ? NodeFilter.FILTER_REJECT : NodeFilter.FILTER_ACCEPT
+    });
+    for (let n = walker.nextNode(); n && out.length < limit; n = walker.nextNode()) {
+        const t = n.nodeValue.trim();
+        if (t) out.push(t);
+    }
+    return out;
+}
+const textOf = el => strings(el, Infinity).join('');
+
+// Single pass over candidate containers, classified against all layouts
+const found = {sdui: [], classic: [], sales_nav: [], generic: []};
+for (const el of document.querySelectorAll('div[data-view-name], div[role], li')) {
+    if (el.tagName === 'DIV') {
+        if (el.getAttribute('data-view-name') === 'people-search-result') found.sdui.push(el);
+        else if (el.getAttribute('role') === 'listitem') found.generic.push(el);
+    } else if (el.classList.contains('reusable-search__result-container')) {
+        found.classic.push(el);
+    } else if ([...el.classList].some(c => c.includes('artdeco-list__item'))) {
+        found.sales_nav.push(el);
+    }
+}
+// A layout remembered from earlier pages wins over the waterfall
+const layout = (knownLayout && found[knownLayout] && found[knownLayout].length) ? knownLayout
+    : ['sdui', 'classic', 'sales_nav', 'generic'].find(name => found[name].length) || 'generic';
+const containers = found[layout];
+
+function extract(el) {
+    let lockup = null;
+    const anonymized = {}, classTags = {}, links = [];
+    for (const node of el.querySelectorAll('a, span[data-anonymize], div[class]')) {
+        if (node.tagName === 'A') {
+            if (!lockup && node.getAttribute('data-view-name') === 'search-result-lockup-title') lockup = node;
+            else if (hasMarker(node.getAttribute('href') || '', hrefMarkers)) links.push(node);
+        } else if (node.tagName === 'SPAN') {
+            const field = ANONYMIZED[node.getAttribute('data-anonymize')];
+            if (field && !(field in anonymized)) anonymized[field] = node;
+        } else {
+            for (const c of node.classList) {
+                const field = hasMarker(c, headlineMarkers) ? 'headline' : hasMarker(c, locationMarkers) ? 'location' : null;
+                if (field && !(field in classTags)) classTags[field] = node;
+            }
+        }
+    }
+
+    let nameTag = lockup;
+    if (!nameTag && anonymized.name) nameTag = anonymized.name.closest('a');
+    if (!nameTag) nameTag = links.find(link => {
+        const t = textOf(link);
+        return t.length > 2 && !t.includes('Connect') && !t.includes('Message');
+    });
+    if (!nameTag) return null;
+
+    const blocks = strings(el, 4);
+    const headlineTag = classTags.headline || anonymized.headline;
+    const locationTag = classTags.location || anonymized.location;
+    return [
+        textOf(nameTag).split('\\n')[0].trim(),
+        nameTag.getAttribute('href'),
+        headlineTag ? textOf(headlineTag) : (blocks.length > 2 ? blocks[2] : null),
+        locationTag ? textOf(locationTag) : (blocks.length > 3 ? blocks[3] : null),
+    ];
+}
+
+const records = [];
+let failedHtml = null;
+containers.forEach((el, i) => {
+    const record = extract(el);
+    if (record) records.push(record);
+    else if (i === 0) failedHtml = el.outerHTML;
+});
+return {layout: layout, containers: containers.length, records: records, failed_html: failedHtml};
+"""
+
+
+def extract_in_browser(driver, layout=None):
+    """
+    Extract the current search page inside the browser; layout is the one
+    remembered from earlier pages, if any.
+    Returns (layout, container count, profiles, outerHTML of the first container if it failed).
+    """
+    data = driver.execute_script(
+        EXTRACT_SCRIPT, list(PROFILE_HREF_MARKERS), list(HEADLINE_CLASS_MARKERS), list(LOCATION_CLASS_MARKERS), layout
+    )
+    layout = data["layout"]
+    profiles = []
+    for name, href, headline, location in data["records"]:
+        profile = Profile(name=name, url=normalize_profile_url(href), layout=layout)
+        if headline is not None:
+            profile.headline = headline
+        if location is not None:
+            profile.location = location
+        if profile.url != "N/A":
+            profiles.append(profile)
+    return layout, data["containers"], profiles, data["failed_html"]
@@ -0,0 +1,128 @@
+"""
+Debug artifacts captured from failures during a run.
+
+Instead of overwriting debug_page_source.html on the hot path, each artifact
+is handed to a background thread that writes it gzip-compressed under a
+timestamped name, e.g. debug_captures/page_source-20240501-142233-481-0007.html.gz.
+The first failure of each kind in a run is always kept, later ones are sampled
+(sample_rate), and the oldest files are evicted beyond max_files / max_bytes.
+If the writer falls behind, new artifacts are dropped rather than waited for.
+
+Captures are regular HTML once decompressed; bench/bench_extraction.py and
+extraction.py read the .html.gz files directly, so failures become fixtures.
+"""
+import gzip
+import json
+import os
+import queue
+import random
+import threading
+import time
+from collections import Counter
+
+from bot_logging import get_logger
+
+log = get_logger("debug")
+
+SUFFIX = ".html.gz"
+
+
+class DebugCapture:
+    def __init__(self, directory="debug_captures", sample_rate=1.0, max_files=200,
+                 max_bytes=50 * 1024 * 1024, queue_size=16):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = None
+        self.seen = Counter()
+        self.dropped = 0
+        self.sequence = 0
+        self.files = None  # [(name, size)] oldest first, loaded by the writer thread
+
+    def capture(self, kind, html, **meta):
+        """Queue an artifact; returns the file name it will be written to, or None if sampled out/dropped"""
+        self.seen[kind] += 1
+        if self.seen[kind] > 1 and random.random() >= self.sample_rate:
+            return None
+
+        now = time.time()
+        self.sequence += 1
+        name = (f"{kind}-{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}"
+                f"-{int(now * 1000) % 1000:03d}-{self.sequence:04d}{SUFFIX}")
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="debug-capture", daemon=True)
+            self.thread.start()
+        try:
+            self.queue.put_nowait((name, html, {"kind": kind, "captured_at": round(now, 3), **meta}))
+        except queue.Full:
+            self.dropped += 1
+            return None
+        return os.path.join(self.directory, name)
+
+    def _scan(self):
+        """Existing captures, oldest first across kinds, so eviction removes the oldest artifacts"""
+        existing = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(SUFFIX):
+                continue
+            try:
+                existing.append((os.stat(os.path.join(self.directory, name)), name))
+            except OSError:
+                pass  # Removed meanwhile
+        return [(name, st.st_size) for st, name in sorted(existing, key=lambda e: (e[0].st_mtime, e[1]))]
+
+    def _run(self):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self.files = self._scan()
+        except OSError as e:
+            # Keep draining the queue (each write fails and is logged) so close() never blocks
+            log.warning("Debug capture directory %s unusable: %s", self.directory, e)
+            self.files = []
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            try:
+                self._write(*item)
+            except Exception as e:
+                # The thread must outlive any single bad artifact, or the queue fills up
+                log.warning("Could not write debug capture %s: %s", item[0], e)
+
+    def _write(self, name, html, meta):
+        path = os.path.join(self.directory, name)
+        # Metadata as a leading comment keeps the artifact a single parseable HTML file
+        header = f"<!-- debug-capture {json.dumps(meta, default=str).replace('--', '- -')} -->\n"
+        data = gzip.compress((header + html).encode("utf-8"), compresslevel=6)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self.files.append((name, len(data)))
+        log.debug("Debug capture written: %s (%.0f KB)", path, len(data) / 1024)
+        self._evict()
+
+    def _evict(self):
+        total = sum(size for _, size in self.files)
+        while self.files and (len(self.files) > self.max_files or total > self.max_bytes):
+            name, size = self.files.pop(0)
+            total -= size
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def close(self, timeout=10):
+        """Finish pending writes and stop the writer thread"""
+        if self.thread is None:
+            return
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            log.warning("Debug capture writer not responding, pending captures abandoned.")
+        self.thread.join(timeout)
+        self.thread = None
+        if self.dropped:
+            log.warning("%s debug captures dropped (writer busy).", self.dropped)
@@ -0,0 +1,129 @@
+"""
+Persistent index of profile URLs that were already processed, shared across runs.
+
+Two representations with the same interface (contains / add / flush / close):
+- HashedSet: exact. Stores a 64-bit digest per URL, persisted as an append-only
+  file of packed digests (8 bytes per entry on disk).
+- BloomFilter: fixed memory regardless of entries (about 1.2 MB for 1M URLs at
+  a 1% false-positive rate). A false positive means a profile is skipped.
+
+URLs are keyed after the same normalization as extraction.normalize_profile_url
+(query string stripped), plus trailing slash and case folding.
+"""
+import hashlib
+import math
+import os
+import struct
+from array import array
+
+from extraction import normalize_profile_url
+
+DEDUP_MODES = ("set", "bloom", "off")
+BLOOM_MAGIC = b"LBF1"
+BLOOM_HEADER = struct.Struct("<4sQIQ")  # magic, bit count, hash count, entries added
+
+
+def dedup_key(url):
+    return normalize_profile_url(url).rstrip("/").lower()
+
+
+def url_digest(url):
+    """128-bit digest of the normalized URL as two 64-bit ints"""
+    digest = hashlib.blake2b(dedup_key(url).encode("utf-8"), digest_size=16).digest()
+    return struct.unpack("<QQ", digest)
+
+
+class HashedSet:
+    def __init__(self, path):
+        self.path = path
+        self.digests = set()
+        if os.path.exists(path):
+            packed = array("Q")
+            with open(path, "rb") as f:
+                data = f.read()
+            # Ignore a torn trailing write from a crash
+            packed.frombytes(data[:len(data) - len(data) % packed.itemsize])
+            self.digests.update(packed)
+        self.file = open(path, "ab")
+
+    def __len__(self):
+        return len(self.digests)
+
+    def contains(self, url):
+        return url_digest(url)[0] in self.digests
+
+    def add(self, url):
+        digest = url_digest(url)[0]
+        if digest not in self.digests:
+            self.digests.add(digest)
+            self.file.write(struct.pack("<Q", digest))
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class BloomFilter:
+    def __init__(self, path, capacity=500_000, error_rate=0.01):
+        self.path = path
+        self.dirty = False
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                magic, self.size, self.hashes, self.count = BLOOM_HEADER.unpack(f.read(BLOOM_HEADER.size))
+                if magic != BLOOM_MAGIC:
+                    raise ValueError(f"{path} is not a Bloom filter index")
+                self.bits = bytearray(f.read())
+        else:
+            # Standard sizing: m = -n ln p / (ln 2)^2, k = m/n ln 2
+            self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+            self.hashes = max(1, round(self.size / capacity * math.log(2)))
+            self.count = 0
+            self.bits = bytearray((self.size + 7) // 8)
+
+    def __len__(self):
+        return self.count
+
+    def positions(self, url):
+        # Double hashing: h1 + i * h2 gives k independent-enough positions
+        h1, h2 = url_digest(url)
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def contains(self, url):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self.positions(url))
+
+    def add(self, url):
+        added = False
+        for pos in self.positions(url):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+            self.dirty = True
+
+    def flush(self):
+        if not self.dirty:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(BLOOM_HEADER.pack(BLOOM_MAGIC, self.size, self.hashes, self.count))
+            f.write(self.bits)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def close(self):
+        self.flush()
+
+
+def open_seen_index(base_path="seen_profiles", mode="set", capacity=500_000, error_rate=0.01):
+    """Open the index for mode ('set', 'bloom' or 'off' -> None)"""
+    if mode not in DEDUP_MODES:
+        raise ValueError(f"Unknown dedup mode '{mode}'. Choose from: {', '.join(DEDUP_MODES)}")
+    if mode == "off":
+        return None
+    if mode == "bloom":
+        return BloomFilter(f"{base_path}.bloom", capacity, error_rate)
+    return HashedSet(f"{base_path}.set")
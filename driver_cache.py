@@ -0,0 +1,48 @@
+"""
+Cache of the resolved chromedriver binary.
+
+ChromeDriverManager().install() resolves the Chrome/driver versions (and may
+hit the network) on every launch. The resolved path is kept in a small JSON
+file and reused until it is missing or older than max_age.
+"""
+import json
+import os
+import time
+
+from webdriver_manager.chrome import ChromeDriverManager
+
+from bot_logging import get_logger
+
+log = get_logger("driver")
+
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+
+def resolve_driver_path(cache_file=".driver_cache.json", max_age=DEFAULT_MAX_AGE):
+    """Return (driver path, source): source is "explicit", "hit" or "miss" """
+    # An explicit path always wins and never involves the cache
+    explicit = os.getenv("LINKEDIN_CHROMEDRIVER")
+    if explicit:
+        return explicit, "explicit"
+
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            cached = json.load(f)
+        if os.path.exists(cached["path"]) and time.time() - cached["resolved_at"] < max_age:
+            return cached["path"], "hit"
+    except (OSError, ValueError, KeyError):
+        pass
+
+    path = ChromeDriverManager().install()
+    with open(cache_file, "w", encoding="utf-8") as f:
+        json.dump({"path": path, "resolved_at": time.time()}, f)
+    log.info("Resolved chromedriver: %s", path)
+    return path, "miss"
+
+
+def invalidate(cache_file=".driver_cache.json"):
+    """Forget the cached path (e.g. after Chrome updated and the driver no longer matches)"""
+    try:
+        os.remove(cache_file)
+    except OSError:
+        pass
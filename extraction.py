@@ -0,0 +1,283 @@
+"""
+Offline extraction of LinkedIn search result pages.
+
+Takes raw page HTML (str or bytes) and returns Profile records, so saved pages
+like debug_page_source.html can be re-parsed without driving a browser:
+
+    python extraction.py debug_page_source.html debug_extraction_fail.html
+
+The parser backend is selectable (LINKEDIN_PARSER or --parser); lxml is used
+when installed since the pure-Python html.parser dominates CPU on large pages.
+"""
+import csv
+import gzip
+import os
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+
+from bs4 import BeautifulSoup, CData, NavigableString, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+LINKEDIN_BASE_URL = "https://www.linkedin.com"
+
+# Layout names, in the order the container waterfall tries them
+LAYOUT_SDUI = "sdui"                # New UI / SDUI (Standard & Hybrid)
+LAYOUT_CLASSIC = "classic"          # Classic Standard UI
+LAYOUT_SALES_NAV = "sales_nav"      # Classic Sales Navigator
+LAYOUT_GENERIC = "generic"          # Generic role=listitem fallback
+
+LAYOUT_ORDER = (LAYOUT_SDUI, LAYOUT_CLASSIC, LAYOUT_SALES_NAV, LAYOUT_GENERIC)
+LAYOUT_TAGS = {LAYOUT_SDUI: "div", LAYOUT_CLASSIC: "li", LAYOUT_SALES_NAV: "li", LAYOUT_GENERIC: "div"}
+
+# Parser backends: name -> (BeautifulSoup features, strain search pages)
+# Strained parsing only builds <div>/<li> subtrees, skipping <head> and stray scripts.
+PARSER_BACKENDS = {
+    "lxml": ("lxml", False),
+    "lxml-strained": ("lxml", True),
+    "html.parser": ("html.parser", False),
+}
+DEFAULT_PARSER = os.getenv("LINKEDIN_PARSER", "lxml" if HAS_LXML else "html.parser")
+SEARCH_RESULTS_STRAINER = SoupStrainer(["div", "li"])
+
+# hrefs that point at a person (Standard profile, Sales Nav people/lead pages)
+PROFILE_HREF_MARKERS = ("/in/", "/sales/people", "/sales/lead/")
+
+
+# slots: no per-record __dict__, records stay small when pages and queues grow
+@dataclass(slots=True)
+class Profile:
+    name: str = "Unknown"
+    url: str = "N/A"
+    headline: str = "No Headline"
+    location: str = "No Location"
+    layout: str = LAYOUT_GENERIC
+
+
+def read_page(path):
+    """Raw bytes of a saved page; .gz files (debug captures) are decompressed"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        return f.read()
+
+
+def normalize_profile_url(href):
+    """Strip the query string and make relative links absolute"""
+    if not href:
+        return "N/A"
+    href = href.split('?')[0]
+    if href.startswith("/"):
+        return f"{LINKEDIN_BASE_URL}{href}"
+    return href
+
+
+def make_soup(html, parser=None, search_page=False):
+    """Parse html with the selected backend (falls back to html.parser without lxml)"""
+    parser = parser or DEFAULT_PARSER
+    if parser not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{parser}'. Choose from: {', '.join(PARSER_BACKENDS)}")
+    features, strained = PARSER_BACKENDS[parser]
+    if features == "lxml" and not HAS_LXML:
+        features = "html.parser"
+    parse_only = SEARCH_RESULTS_STRAINER if strained and search_page else None
+    return BeautifulSoup(html, features, parse_only=parse_only)
+
+
+def classify_container(tag):
+    """Return the layout a <div>/<li> is a result container for, or None"""
+    if tag.name == "div":
+        # 1. New UI / SDUI (Standard & Hybrid)
+        if tag.get("data-view-name") == "people-search-result":
+            return LAYOUT_SDUI
+        # 4. Generic Fallback
+        if tag.get("role") == "listitem":
+            return LAYOUT_GENERIC
+    elif tag.name == "li":
+        classes = tag.get("class") or ()
+        # 2. Classic Standard UI
+        if "reusable-search__result-container" in classes:
+            return LAYOUT_CLASSIC
+        # 3. Classic Sales Navigator (class substring)
+        if any("artdeco-list__item" in c for c in classes):
+            return LAYOUT_SALES_NAV
+    return None
+
+
+def find_result_containers(soup, layout=None):
+    """
+    Classify every candidate container against all layouts in a single pass,
+    then apply the waterfall: the most specific/modern layout that matched wins.
+    If the layout is already known (remembered from an earlier page), only that
+    layout's containers are looked for first.
+    Returns (layout, containers).
+    """
+    if layout in LAYOUT_TAGS:
+        results = [tag for tag in soup.find_all(LAYOUT_TAGS[layout]) if classify_container(tag) == layout]
+        if results:
+            return layout, results
+
+    found = {layout: [] for layout in LAYOUT_ORDER}
+    for tag in soup.find_all(["div", "li"]):
+        layout = classify_container(tag)
+        if layout:
+            found[layout].append(tag)
+
+    for layout in LAYOUT_ORDER:
+        if found[layout]:
+            return layout, found[layout]
+    return LAYOUT_GENERIC, []
+
+
+# Class-name substrings that mark headline / location blocks in classic layouts
+HEADLINE_CLASS_MARKERS = ("entity-result__headline", "search-result__snippet")
+LOCATION_CLASS_MARKERS = ("entity-result__secondary-subtitle",)
+
+# Sales Navigator data-anonymize values -> field
+ANONYMIZED_FIELDS = {"person-name": "name", "title": "headline", "location": "location"}
+
+
+@lru_cache(maxsize=8192)
+def class_token_field(token):
+    """
+    Map a single class token to 'headline', 'location' or None.
+    Memoized: pages reuse a small set of class names, so the substring checks
+    run once per distinct token instead of once per node.
+    """
+    if any(marker in token for marker in HEADLINE_CLASS_MARKERS):
+        return "headline"
+    if any(marker in token for marker in LOCATION_CLASS_MARKERS):
+        return "location"
+    return None
+
+
+def is_name_link(link):
+    """Heuristic: Name links are usually not empty and aren't buttons/images"""
+    text = link.get_text(strip=True)
+    return len(text) > 2 and "Connect" not in text and "Message" not in text
+
+
+def extract_profile(result, layout=LAYOUT_GENERIC):
+    """
+    Extract a Profile from one result container in a single walk of its subtree,
+    collecting the name link candidates, headline/location tags and the first
+    text blocks together.
+    Returns None if no name link could be found.
+    """
+    lockup_link = None          # Priority 1: New UI title link
+    anonymized = {}             # Priority 2: Sales Nav data-anonymize spans
+    profile_links = []          # Priority 3: any link to a profile (checked lazily)
+    class_tags = {}             # first headline/location div by class
+    text_blocks = []            # first stripped strings, for positional fallback
+
+    string_types = result.interesting_string_types or (NavigableString, CData)
+    if isinstance(string_types, type):
+        string_types = (string_types,)
+
+    for node in result.descendants:
+        if isinstance(node, NavigableString):
+            if len(text_blocks) < 4 and type(node) in string_types:
+                text = node.strip()
+                if text:
+                    text_blocks.append(text)
+            continue
+
+        name = node.name
+        attrs = node.attrs
+        if name == "a":
+            if lockup_link is None and attrs.get("data-view-name") == "search-result-lockup-title":
+                lockup_link = node
+            elif any(marker in attrs.get("href", "") for marker in PROFILE_HREF_MARKERS):
+                profile_links.append(node)
+        elif name == "span":
+            field = ANONYMIZED_FIELDS.get(attrs.get("data-anonymize"))
+            if field and field not in anonymized:
+                anonymized[field] = node
+        elif name == "div":
+            for token in attrs.get("class") or ():
+                field = class_token_field(token)
+                if field and field not in class_tags:
+                    class_tags[field] = node
+
+    # --- Name & URL ---
+    name_tag = lockup_link
+    if name_tag is None and "name" in anonymized:
+        name_tag = anonymized["name"].find_parent("a")
+    if name_tag is None:
+        name_tag = next((link for link in profile_links if is_name_link(link)), None)
+    if name_tag is None:
+        return None
+
+    profile = Profile(layout=layout)
+    # Clean up name
+    profile.name = name_tag.get_text(strip=True).split("\n")[0].strip()
+    profile.url = normalize_profile_url(name_tag.get("href"))
+
+    # --- Headline & Location: class match, then Sales Nav span, then text position ---
+    headline_tag = class_tags.get("headline") or anonymized.get("headline")
+    if headline_tag:
+        profile.headline = headline_tag.get_text(strip=True)
+    elif len(text_blocks) > 2:
+        profile.headline = text_blocks[2]
+
+    location_tag = class_tags.get("location") or anonymized.get("location")
+    if location_tag:
+        profile.location = location_tag.get_text(strip=True)
+    elif len(text_blocks) > 3:
+        profile.location = text_blocks[3]
+
+    return profile
+
+
+def iter_search_results(html, parser=None):
+    """Parse a search results page and yield its Profiles; the parse tree is freed after the last one"""
+    soup = make_soup(html, parser, search_page=True)
+    try:
+        layout, results = find_result_containers(soup)
+        for result in results:
+            profile = extract_profile(result, layout)
+            if profile and profile.url != "N/A":
+                yield profile
+    finally:
+        # The tree is a web of parent/child cycles: decompose frees it now, not at the next gc pass
+        soup.decompose()
+
+
+def extract_search_results(html, parser=None):
+    """Parse a search results page and return the list of Profiles found on it"""
+    return list(iter_search_results(html, parser))
+
+
+def parse_profile_page(html, parser=None):
+    """Extract name and headline from a full profile page"""
+    soup = make_soup(html, parser)
+    data = {}
+
+    # Try to find name (This selector might change, using generic reliable ones)
+    # New profile layout selector, then fallback for older layouts
+    name_tag = soup.find("h1", {"class": "text-heading-xlarge"}) or soup.find("h1")
+    data['name'] = name_tag.get_text(strip=True).split("\n")[0].strip() if name_tag else "Unknown"
+
+    # Look for div with text-body-medium class
+    headline_tag = soup.find("div", {"class": "text-body-medium"})
+    data['headline'] = headline_tag.get_text(strip=True) if headline_tag else "No Headline"
+    return data
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Extract profiles from saved search result pages")
+    arg_parser.add_argument("pages", nargs="+", help="Saved HTML pages")
+    arg_parser.add_argument("--parser", choices=list(PARSER_BACKENDS), default=DEFAULT_PARSER, help="Parser backend")
+    args = arg_parser.parse_args()
+
+    writer = csv.writer(sys.stdout)
+    writer.writerow(['Name', 'Profile URL', 'Headline', 'Location', 'Layout', 'Source'])
+    for path in args.pages:
+        for p in iter_search_results(read_page(path), args.parser):
+            writer.writerow([p.name, p.url, p.headline, p.location, p.layout, path])
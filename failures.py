@@ -0,0 +1,148 @@
+"""
+Failure classification, retry budgets and a circuit breaker.
+
+A failed profile visit is classified from the page itself (one execute_script
+call) or from the WebDriver exception, so a rate-limit interstitial, a
+captcha, an expired session and a missing button are told apart:
+
+    rate_limited, captcha, session_expired   blocking: the session is not usable
+    not_found, element_missing               final for that profile
+    transient                                timeouts / driver hiccups, retried
+
+RETRY_POLICY gives each kind a retry budget and a base backoff. The
+CircuitBreaker trips when blocking failures repeat within a window of recent
+outcomes, and the run stops cleanly instead of burning page loads.
+"""
+import random
+import re
+from collections import deque
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+
+RATE_LIMITED = "rate_limited"
+CAPTCHA = "captcha"
+SESSION_EXPIRED = "session_expired"
+NOT_FOUND = "not_found"
+ELEMENT_MISSING = "element_missing"
+TRANSIENT = "transient"
+UNKNOWN = "unknown"
+
+BLOCKING = frozenset((RATE_LIMITED, CAPTCHA, SESSION_EXPIRED))
+
+# kind -> (retries, base backoff seconds); kinds not listed are not retried
+RETRY_POLICY = {
+    TRANSIENT: (2, 5),
+    RATE_LIMITED: (1, 60),
+    SESSION_EXPIRED: (1, 0),  # retried after logging in again
+}
+
+# Path prefixes, matched on whole path segments: /in/loginova-anna/ is not a login page
+CAPTCHA_URL_MARKERS = ("/checkpoint/challenge", "/checkpoint/lg", "/captcha")
+LOGIN_URL_MARKERS = ("/login", "/uas/login", "/authwall", "/signup")
+NOT_FOUND_URL_MARKERS = ("/404", "/in/unavailable")
+RATE_LIMIT_TEXT = (
+    "too many requests", "you've reached the weekly invitation limit", "reached the weekly limit",
+    "you've reached the limit", "unusual activity", "try again later",
+)
+NOT_FOUND_TEXT = ("this page doesn't exist", "this profile is not available", "page not found")
+# An HTTP error page titled "429 ...", not a "(429) Name | LinkedIn" notification count
+RATE_LIMIT_TITLE = re.compile(r"^\s*429\b")
+
+# arguments: [by, value] of the element a normal page shows, or null.
+# Body text is user content on a normal page, so it is only read when that element is missing;
+# its first part is enough to recognise an interstitial.
+CLASSIFY_SCRIPT = """
+const captcha = !!document.querySelector("iframe[src*='captcha'], #captcha-internal, form[action*='checkpoint']");
+const [by, value] = arguments[0] || [null, null];
+let expected = false;
+if (by === 'xpath') {
+    expected = !!document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+} else if (by === 'css selector') {
+    expected = !!document.querySelector(value);
+} else if (by === 'tag name') {
+    expected = document.getElementsByTagName(value).length > 0;
+} else if (by === 'id') {
+    expected = !!document.getElementById(value);
+}
+const body = !expected && document.body ? document.body.innerText.slice(0, 4000) : null;
+return [location.href, document.title, captcha, body];
+"""
+
+
+class BotFailure(Exception):
+    def __init__(self, kind, detail=""):
+        super().__init__(f"{kind}: {detail}" if detail else kind)
+        self.kind = kind
+
+
+class CircuitOpen(BotFailure):
+    """Blocking failures repeated: stop the run, state is already checkpointed"""
+
+
+def on_path(url, prefixes):
+    """True if the path of url is one of prefixes or lies below one of them"""
+    path = urlsplit(url or "").path.lower()
+    return any(path == prefix or path.startswith(prefix + "/") for prefix in prefixes)
+
+
+def classify_page(driver, expected=None):
+    """
+    Failure kind shown by the current page, or None if it looks normal.
+    expected: locator of an element a normal page has (e.g. the profile name); when it is
+    present only URL and DOM markers are checked, never the page's text.
+    """
+    url, title, captcha, body = driver.execute_script(CLASSIFY_SCRIPT, list(expected) if expected else None)
+    if captcha or on_path(url, CAPTCHA_URL_MARKERS):
+        return CAPTCHA
+    if on_path(url, LOGIN_URL_MARKERS):
+        return SESSION_EXPIRED
+    if on_path(url, NOT_FOUND_URL_MARKERS):
+        return NOT_FOUND
+    if body is None:
+        return None
+    text = f"{title or ''}\n{body}".lower()
+    if RATE_LIMIT_TITLE.match(title or "") or any(marker in text for marker in RATE_LIMIT_TEXT):
+        return RATE_LIMITED
+    if any(marker in text for marker in NOT_FOUND_TEXT):
+        return NOT_FOUND
+    return None
+
+
+def classify_exception(exc):
+    if isinstance(exc, BotFailure):
+        return exc.kind
+    if isinstance(exc, NoSuchElementException):
+        return ELEMENT_MISSING
+    if isinstance(exc, (TimeoutException, WebDriverException)):
+        return TRANSIENT
+    return UNKNOWN
+
+
+def backoff(kind, attempt):
+    """Seconds to wait before retry number `attempt` (0-based) of kind, with jitter"""
+    base = RETRY_POLICY.get(kind, (0, 0))[1]
+    return base * 2 ** attempt * random.uniform(0.8, 1.2)
+
+
+class CircuitBreaker:
+    def __init__(self, threshold=3, window=10):
+        """Trip after `threshold` blocking failures within the last `window` outcomes"""
+        if not 0 < threshold <= window:
+            # A threshold above the window could never be reached
+            raise ValueError(f"Circuit breaker threshold must be between 1 and the window ({window}), got {threshold}")
+        self.threshold = threshold
+        self.window = window
+        self.recent = deque(maxlen=window)
+        self.tripped = False
+
+    def reset(self):
+        self.recent.clear()
+        self.tripped = False
+
+    def record(self, kind=None):
+        """Record an outcome (None = success); returns True once the breaker has tripped"""
+        self.recent.append(kind in BLOCKING)
+        if sum(self.recent) >= self.threshold:
+            self.tripped = True
+        return self.tripped
@@ -0,0 +1,115 @@
+"""
+Lightweight per-step timing for the bot.
+
+    with self.timings.span("parse") as span:
+        ...
+        span["outcome"] = "empty"      # optional, defaults to "ok" / "error"
+
+    @timed("login")                    # method decorator, uses self.timings
+    def login(self): ...
+
+Every span is appended to a JSONL file (one object per line) and kept in
+memory so print_summary() can report count, p50/p95 and outcomes per step.
+"""
+import functools
+import json
+import math
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from bot_logging import get_logger
+
+log = get_logger("timings")
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class Timings:
+    def __init__(self, jsonl_path=None):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.jsonl_path = jsonl_path
+        self.file = None
+        self.durations = defaultdict(list)
+        self.outcomes = defaultdict(Counter)
+        self.counters = Counter()
+
+    @contextmanager
+    def span(self, step, **fields):
+        span = {"outcome": "ok"}
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException:
+            span["outcome"] = "error"
+            raise
+        finally:
+            self.record(step, time.perf_counter() - start, span.pop("outcome"), **fields, **span)
+
+    def record(self, step, duration, outcome="ok", **fields):
+        self.durations[step].append(duration)
+        self.outcomes[step][outcome] += 1
+        self.emit({"step": step, "duration": round(duration, 4), "outcome": outcome, **fields})
+
+    def count(self, name, n=1):
+        """Plain outcome counter (e.g. profiles skipped), reported in the summary"""
+        self.counters[name] += n
+
+    def emit(self, event):
+        if not self.jsonl_path:
+            return
+        if self.file is None:
+            self.file = open(self.jsonl_path, "a", encoding="utf-8")
+        event = {"ts": round(time.time(), 3), "run": self.run_id, **event}
+        self.file.write(json.dumps(event, default=str) + "\n")
+
+    def summary(self):
+        """Rows of (step, count, p50, p95, total seconds, outcomes), slowest total first"""
+        rows = []
+        for step, durations in self.durations.items():
+            ordered = sorted(durations)
+            rows.append((step, len(ordered), percentile(ordered, 50), percentile(ordered, 95),
+                         sum(ordered), dict(self.outcomes[step])))
+        return sorted(rows, key=lambda row: row[4], reverse=True)
+
+    def print_summary(self):
+        rows = self.summary()
+        if not rows and not self.counters:
+            return
+        lines = [f"--- Run report ({self.run_id}) ---",
+                 f"{'step':<24} {'n':>5} {'p50 s':>8} {'p95 s':>8} {'total s':>9}  outcomes"]
+        for step, n, p50, p95, total, outcomes in rows:
+            outcome_text = ", ".join(f"{k}={v}" for k, v in sorted(outcomes.items()))
+            lines.append(f"{step:<24} {n:>5} {p50:>8.2f} {p95:>8.2f} {total:>9.1f}  {outcome_text}")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name}: {value}")
+        if self.file:
+            self.file.flush()
+            lines.append(f"Timings appended to {self.jsonl_path}")
+        log.info("\n".join(lines), extra={"report": rows, "counters": dict(self.counters)})
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+def timed(step):
+    """Method decorator: time the call as a span; a False return counts as 'failed'"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.timings.span(step) as span:
+                result = method(self, *args, **kwargs)
+                if result is False:
+                    span["outcome"] = "failed"
+                return result
+        return wrapper
+    return decorator
@@ -1,23 +1,50 @@
+import gc
 import os
+import re
 import time
-import random
 from dotenv import load_dotenv
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-import csv
-import urllib.parse
-import pickle
+from selenium.common.exceptions import WebDriverException
+from results_store import ResultsStore
+from dedup import DEDUP_MODES, dedup_key, open_seen_index
+from waits import PacingPolicy, Waiter
+from instrumentation import Timings, timed
+from bot_logging import get_logger, setup_logging
+from driver_cache import resolve_driver_path, invalidate as invalidate_driver_cache
+import browser_extraction
+from replay_server import start_replay_server
+import page_weight
+from debug_capture import DebugCapture
+from profile_cache import ProfileCache
+from memory_monitor import MemoryMonitor, RecyclePolicy
+from profiling import RunProfiler
+from message_templates import MessageTemplate
+from results_export import PartitionedExporter
+from session_store import SessionStore, cdp_cookie
+import failures
+from failures import BotFailure, CircuitBreaker, CircuitOpen
+from selector_registry import SelectorRegistry
+from extraction import LAYOUT_SALES_NAV, DEFAULT_PARSER, make_soup, find_result_containers, extract_profile, parse_profile_page
 
 # Load environment variables
 load_dotenv()
 
+log = get_logger()
+
+LINKEDIN_ORIGIN = "https://www.linkedin.com"
+LINKEDIN_URL_PREFIX = re.compile(r"^https?://(?:www\.)?linkedin\.com")
+STATUS_SENT = "Premium Message Sent"
+STATUS_NO_BUTTON = "Message Failed / Connect Skipped"
+STATUS_NOT_FOUND = "Profile Not Found"
+# Outcomes that are final: only these go into the cross-run dedup index, so a lead
+# that failed transiently is tried again by a later run
+FINAL_STATUSES = (STATUS_SENT, STATUS_NO_BUTTON, STATUS_NOT_FOUND)
+
 class LinkedInBot:
     def __init__(self):
         self.email = os.getenv("LINKEDIN_EMAIL")
@@ -25,7 +52,61 @@ class LinkedInBot:
         # Ensure message is handled even if not set in .env
         self.message_template = os.getenv("LINKEDIN_MESSAGE", "Hi {first_name}, I hope this finds you well.") 
         self.message_subject = os.getenv("LINKEDIN_SUBJECT", "Hello")
+        # Compiled once: a bad placeholder fails at startup, not in the middle of a run
+        self.message = MessageTemplate(self.message_template, "LINKEDIN_MESSAGE")
+        self.subject = MessageTemplate(self.message_subject, "LINKEDIN_SUBJECT")
         self.env_search_url = os.getenv("LINKEDIN_SEARCH_URL")
+        # HTML parser backend for page_source (see extraction.PARSER_BACKENDS)
+        self.parser = DEFAULT_PARSER
+        # "browser": extract with one execute_script per page, "soup": parse page_source in Python
+        self.extraction_mode = os.getenv("LINKEDIN_EXTRACTION_MODE", "browser")
+        # SQLite results store with per-search resume checkpoints
+        self.results_db = os.getenv("LINKEDIN_RESULTS_DB", "results.db")
+        # Saved login cookies (JSON); checked locally before the browser is touched
+        self.session = SessionStore(os.getenv("LINKEDIN_SESSION_FILE", "session.json"))
+        # Processed leads are also appended to gzip CSV partitions for analytics ("off" disables)
+        self.export_dir = os.getenv("LINKEDIN_EXPORT_DIR", "exports")
+        self.export_part_rows = int(os.getenv("LINKEDIN_EXPORT_PART_ROWS", "50000"))
+        # Profiles processed in any earlier run are skipped before opening a tab
+        self.dedup_index = os.getenv("LINKEDIN_DEDUP_INDEX", "seen_profiles")
+        self.dedup_mode = os.getenv("LINKEDIN_DEDUP_MODE", "set")
+        # Minimum human-like delay between actions, separate from readiness waits
+        self.pacing = PacingPolicy(float(os.getenv("LINKEDIN_PACING_SCALE", "1")))
+        # Per-step durations, appended as JSONL and summarized at the end of a search
+        self.timings = Timings(os.getenv("LINKEDIN_TIMINGS_FILE", "timings.jsonl"))
+        # Named selectors; the search layout detected on the first page is remembered
+        self.selectors = SelectorRegistry()
+        # Fast start: cached chromedriver path and an optional persistent Chrome profile
+        self.driver_cache = os.getenv("LINKEDIN_DRIVER_CACHE", ".driver_cache.json")
+        self.chrome_profile = os.getenv("LINKEDIN_CHROME_PROFILE")
+        # Lightweight mode: headless and/or resource types that are never downloaded
+        self.headless = os.getenv("LINKEDIN_HEADLESS", "").lower() in ("1", "true", "yes")
+        self.blocked_resources = page_weight.parse_block_list(os.getenv("LINKEDIN_BLOCK"))
+        # Failure artifacts: gzip, timestamped, sampled and capped, written off the main thread
+        self.debug = DebugCapture(
+            os.getenv("LINKEDIN_DEBUG_DIR", "debug_captures"),
+            sample_rate=float(os.getenv("LINKEDIN_DEBUG_SAMPLE", "1")),
+            max_files=int(os.getenv("LINKEDIN_DEBUG_MAX_FILES", "200")),
+            max_bytes=int(float(os.getenv("LINKEDIN_DEBUG_MAX_MB", "50")) * 1024 * 1024),
+        )
+        # Stop the run when rate limits / captchas / logouts repeat within the last N outcomes
+        # (bad settings raise ValueError at startup; reset at the start of each process_leads call)
+        self.breaker = CircuitBreaker(int(os.getenv("LINKEDIN_BREAKER_THRESHOLD", "3")),
+                                      int(os.getenv("LINKEDIN_BREAKER_WINDOW", "10")))
+        # Scraped profile data served locally while fresh ("off" disables the cache)
+        profile_cache = os.getenv("LINKEDIN_PROFILE_CACHE", "profile_cache.db")
+        self.profile_cache = None if profile_cache == "off" else ProfileCache(
+            profile_cache,
+            ttl=float(os.getenv("LINKEDIN_PROFILE_CACHE_TTL", 24 * 3600)),
+            max_entries=int(os.getenv("LINKEDIN_PROFILE_CACHE_SIZE", "5000")),
+        )
+        # Restart the browser after N profiles or above a Chrome memory threshold (0 disables either)
+        self.recycle_policy = RecyclePolicy(int(os.getenv("LINKEDIN_RECYCLE_PROFILES", "200")),
+                                            float(os.getenv("LINKEDIN_RECYCLE_MB", "1500")))
+        self.memory = MemoryMonitor(self.timings)
+        self.profiles_since_restart = 0
+        # Where linkedin.com URLs are actually loaded from (a local replay server for offline runs)
+        self.base_url = os.getenv("LINKEDIN_BASE_URL", LINKEDIN_ORIGIN).rstrip("/")
         
         if not self.email or not self.password:
             raise ValueError("Please set LINKEDIN_EMAIL and LINKEDIN_PASSWORD in .env file")
@@ -34,62 +115,174 @@ class LinkedInBot:
 
     def setup_driver(self):
         chrome_options = Options()
-        # chrome_options.add_argument("--headless") # Comment out to see the browser
-        chrome_options.add_argument("--start-maximized")
+        # Headed and maximized by default; LINKEDIN_HEADLESS / LINKEDIN_BLOCK for the lightweight mode
+        page_weight.configure_options(chrome_options, self.headless, self.blocked_resources)
         chrome_options.add_argument("--disable-notifications")
-        
-        # Use ChromeDriverManager to automatically handle the driver
-        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+
+        profile_warm = False
+        if self.chrome_profile:
+            # Persistent profile: the logged-in session survives restarts without replaying cookies
+            profile_dir = os.path.abspath(self.chrome_profile)
+            profile_warm = os.path.isdir(profile_dir)
+            chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+
+        start = time.perf_counter()
+        with self.timings.span("driver_start", profile_warm=profile_warm, headless=self.headless,
+                               blocked=",".join(self.blocked_resources)) as span:
+            # Resolved driver path is cached instead of running ChromeDriverManager on every start
+            driver_path, source = resolve_driver_path(self.driver_cache)
+            span["driver_cache"] = source
+            try:
+                self.driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+            except WebDriverException:
+                # Only a cached path can be stale; an explicit or fresh one fails as is
+                if source != "hit":
+                    raise
+                # Chrome may have updated since the path was cached
+                log.warning("Cached chromedriver failed to start, resolving again...")
+                invalidate_driver_cache(self.driver_cache)
+                driver_path, _ = resolve_driver_path(self.driver_cache)
+                self.driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+                span["driver_cache"] = "stale"
+            page_weight.install(self.driver, self.blocked_resources)
+        log.info("Browser started in %.1fs (driver cache: %s, profile: %s)", time.perf_counter() - start,
+                 span["driver_cache"], "warm" if profile_warm else ("cold" if self.chrome_profile else "none"))
+
         self.wait = WebDriverWait(self.driver, 15)
+        self.waiter = Waiter(self.driver, self.pacing)
+
+    def measure_page(self, span):
+        """Attach load time and bytes transferred of the current page to a timing span"""
+        try:
+            weight = page_weight.page_weight(self.driver)
+        except WebDriverException:
+            return
+        span.update(weight)
+        self.timings.count("bytes_transferred", weight["bytes"])
+
+    def check_page(self, expected=None):
+        """
+        Raise BotFailure if the current page is an interstitial (rate limit, captcha, login, 404).
+        With expected (the locator of an element a normal page has) the page text is only scanned when it is missing.
+        """
+        try:
+            kind = failures.classify_page(self.driver, expected)
+        except WebDriverException as e:
+            raise BotFailure(failures.TRANSIENT, str(e))
+        if kind:
+            raise BotFailure(kind, self.driver.current_url)
+
+    def restart_driver(self, reason):
+        """Replace the browser, keeping the login (saved cookies or the Chrome profile)"""
+        log.info("Recycling browser (%s)...", reason)
+        with self.timings.span("recycle", reason=reason):
+            self.save_session()
+            self.driver.quit()
+            gc.collect()
+            self.setup_driver()
+            self.login()
+        self.memory.restarts += 1
+        self.profiles_since_restart = 0
+
+    def after_profile(self):
+        """Sample memory and recycle the browser when the policy says so"""
+        self.profiles_since_restart += 1
+        sample = self.memory.sample(self.driver)
+        reason = self.recycle_policy.check(self.profiles_since_restart, sample["browser_mb"])
+        if reason:
+            self.restart_driver(reason)
 
     def random_sleep(self, min_seconds=2, max_seconds=5):
-        time.sleep(random.uniform(min_seconds, max_seconds))
-
-    def save_session(self, filename="cookies.pkl"):
-        """Save cookies to a file"""
-        pickle.dump(self.driver.get_cookies(), open(filename, "wb"))
-        print("Session cookies saved.")
-
-    def load_session(self, filename="cookies.pkl"):
-        """Load cookies from a file"""
-        if os.path.exists(filename):
-            cookies = pickle.load(open(filename, "rb"))
-            # We need to be on the domain to set cookies
-            self.driver.get("https://www.linkedin.com")
+        """Pacing-only pause (scaled by LINKEDIN_PACING_SCALE)"""
+        self.pacing.pause(min_seconds, max_seconds)
+
+    def site_url(self, url):
+        """Map a linkedin.com URL onto base_url; stored URLs stay canonical"""
+        if self.base_url == LINKEDIN_ORIGIN:
+            return url
+        return LINKEDIN_URL_PREFIX.sub(self.base_url, url, count=1)
+
+    def canonical_url(self, url):
+        """Reverse of site_url: a browser URL on base_url back onto linkedin.com, for storing"""
+        if self.base_url == LINKEDIN_ORIGIN or not url.startswith(self.base_url):
+            return url
+        return LINKEDIN_ORIGIN + url[len(self.base_url):]
+
+    def on_page(self, url):
+        """True if the browser already shows url (query string, trailing slash and case ignored)"""
+        return dedup_key(self.driver.current_url) == dedup_key(self.site_url(url))
+
+    def save_session(self):
+        """Save the browser's unexpired cookies to the session file"""
+        if self.base_url != LINKEDIN_ORIGIN:
+            # Replay cookies belong to the local server, keep the real session file
+            return
+        kept = self.session.save(self.driver.get_cookies())
+        log.info("Session cookies saved (%s).", kept)
+
+    @timed("load_session")
+    def load_session(self):
+        """Install the saved cookies if the session is still valid locally; nothing is loaded otherwise"""
+        if self.base_url != LINKEDIN_ORIGIN:
+            # The real linkedin.com cookies mean nothing to a replay server
+            return False
+        cookies, reason = self.session.load()
+        if cookies is None:
+            log.info("Saved session not usable: %s.", reason)
+            if os.path.exists("cookies.pkl"):
+                log.info("cookies.pkl (pickle) is no longer read; the next login saves %s.", self.session.path)
+            return False
+        try:
+            # Set before the first navigation, so the feed load already carries the session
+            self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": [cdp_cookie(c) for c in cookies]})
+        except WebDriverException:
+            # No DevTools: cookies can only be added while on the domain
+            self.driver.get(self.site_url(LINKEDIN_ORIGIN))
             for cookie in cookies:
-                # Filter out 'expiry' that is not a valid date format, which can cause issues
-                if 'expiry' in cookie and not isinstance(cookie['expiry'], int):
-                     del cookie['expiry']
                 try:
                     self.driver.add_cookie(cookie)
-                except Exception as e:
-                    # Some cookies might fail if domain doesn't match exactly, ignore
+                except WebDriverException:
                     pass
-            print("Session cookies loaded.")
-            self.driver.refresh()
-            return True
-        return False
+        log.info("Session cookies loaded (%s).", len(cookies))
+        return True
+
+    def feed_logged_in(self):
+        """Load the feed and check the session is logged in"""
+        self.driver.get(self.site_url(f"{LINKEDIN_ORIGIN}/feed/"))
+        # A logged-out session is redirected to a login page (whose query may still mention the feed):
+        # no element wait in that case
+        if failures.on_path(self.driver.current_url, failures.LOGIN_URL_MARKERS):
+            return False
+        return bool(self.waiter.element(self.selectors.get("global_nav"), timeout=5))
 
+    @timed("login")
     def login(self):
-        print("Checking for existing session...")
+        log.info("Checking for existing session...")
+        if self.chrome_profile:
+            # The persistent profile keeps LinkedIn's own cookies: just check the feed loads logged in
+            if self.feed_logged_in():
+                log.info("Session restored from Chrome profile.")
+                return
+
         if self.load_session():
-            self.random_sleep(2, 4)
-            # Verify if we are actually logged in by checking for a known element like the home feed (or 'feed')
-            if "feed" in self.driver.current_url or "global-nav" in self.driver.page_source:
-                print("Restored session successfully.")
+            if self.feed_logged_in():
+                log.info("Restored session successfully.")
                 return
+            log.info("Saved session was rejected.")
+            if self.base_url == LINKEDIN_ORIGIN:
+                self.session.clear()
 
-        print("Logging in with credentials...")
-        self.driver.get("https://www.linkedin.com/login")
-        self.random_sleep()
+        log.info("Logging in with credentials...")
+        self.driver.get(self.site_url(f"{LINKEDIN_ORIGIN}/login"))
+        self.waiter.element(self.selectors.get("login_username"), floor=(1, 2))
 
         try:
-            email_input = self.wait.until(EC.presence_of_element_located((By.ID, "username")))
+            email_input = self.wait.until(EC.presence_of_element_located(self.selectors.get("login_username")))
             email_input.clear()
             email_input.send_keys(self.email)
             self.random_sleep(1, 2)
 
-            password_input = self.driver.find_element(By.ID, "password")
+            password_input = self.driver.find_element(*self.selectors.get("login_password"))
             password_input.clear()
             password_input.send_keys(self.password)
             self.random_sleep(1, 2)
@@ -97,173 +290,169 @@ class LinkedInBot:
             password_input.send_keys(Keys.RETURN)
             
             # Wait for home page or verification
-            self.wait.until(EC.presence_of_element_located((By.ID, "global-nav")))
-            print("Login successful.")
+            self.wait.until(EC.presence_of_element_located(self.selectors.get("global_nav")))
+            log.info("Login successful.")
             self.save_session()
         except Exception as e:
-            print(f"Login might have failed or verify needed. Check browser. Error: {e}")
+            log.warning("Login might have failed or verify needed. Check browser. Error: %s", e)
             input("Press Enter to continue if you handled captcha manually...")
             # Save session assuming user fixed it manually
             self.save_session()
 
-    def scrape_profile(self, profile_url):
-        print(f"Navigating to {profile_url} to scrape data...")
-        self.driver.get(profile_url)
-        self.random_sleep(3, 6)
-
-        soup = BeautifulSoup(self.driver.page_source, "html.parser")
-        
-        data = {}
-        
-        # Try to find name (This selector might change, using generic reliable ones)
-        try:
-            # New profile layout selector
-            name_tag = soup.find("h1", {"class": "text-heading-xlarge"})
-            if not name_tag:
-                 # Fallback for older layouts
-                 name_tag = soup.find("h1")
-
-            data['name'] = name_tag.get_text(strip=True).split("\n")[0].strip() if name_tag else "Unknown"
-        except:
-            data['name'] = "Unknown"
-
-        # headline
-        try:
-            # Look for div with text-body-medium class
-            headline_tag = soup.find("div", {"class": "text-body-medium"})
-            data['headline'] = headline_tag.get_text(strip=True) if headline_tag else "No Headline"
-        except:
-            data['headline'] = "No Headline"
-            
-        print(f"Scraped Data: {data}")
+    @timed("scrape_profile")
+    def scrape_profile(self, profile_url, refresh=False):
+        if self.profile_cache and not refresh:
+            data = self.profile_cache.get(profile_url)
+            if data is not None:
+                self.timings.count("profile_cache: hit")
+                log.info("Cached Data: %s", data)
+                return data
+
+        log.info("Navigating to %s to scrape data...", profile_url)
+        self.driver.get(self.site_url(profile_url))
+        self.waiter.element(self.selectors.get("profile_name"), floor=(1, 2))
+        # An authwall or rate-limit page would otherwise be parsed (and cached) as the profile
+        self.check_page(expected=self.selectors.get("profile_name"))
+
+        data = parse_profile_page(self.driver.page_source, self.parser)
+        if self.profile_cache:
+            self.timings.count("profile_cache: miss")
+            self.profile_cache.put(profile_url, data)
+
+        log.info("Scraped Data: %s", data)
         return data
 
+    @timed("send_connection_request")
     def send_connection_request(self, profile_url, message_note=None):
         """
         Tries to connect. If message_note is provided, adds a note.
         """
         # Ensure we are on the page
-        if self.driver.current_url != profile_url:
-            self.driver.get(profile_url)
-            self.random_sleep(3, 5)
+        if not self.on_page(profile_url):
+            self.driver.get(self.site_url(profile_url))
+            self.waiter.page_ready(floor=(1, 2))
 
         try:
             # Look for "Connect" button
             connect_button = None
             
             # 1. Try primary buttons
-            buttons = self.driver.find_elements(By.XPATH, "//button[span[text()='Connect']]")
+            buttons = self.driver.find_elements(*self.selectors.get("connect_button"))
             if buttons:
                 connect_button = buttons[0]
             else:
                 # 2. Check "More" menu
-                print("Connect button not found in primary actions, checking 'More' menu...")
+                log.info("Connect button not found in primary actions, checking 'More' menu...")
                 # Search for 'More actions' or similar accessibility label
-                more_buttons = self.driver.find_elements(By.XPATH, "//button[contains(@aria-label, 'More actions')]")
+                more_buttons = self.driver.find_elements(*self.selectors.get("more_actions"))
                 if more_buttons:
                     more_buttons[0].click()
                     self.random_sleep(1, 2)
                     # Check the dropdown for the connect button
-                    dropdown_connect = self.driver.find_elements(By.XPATH, "//div[contains(@class, 'artdeco-dropdown')]//div[span[text()='Connect']]")
+                    dropdown_connect = self.driver.find_elements(*self.selectors.get("dropdown_connect"))
                     if dropdown_connect:
                         connect_button = dropdown_connect[0]
             
             if connect_button:
                 connect_button.click()
-                self.random_sleep(1, 2)
+                self.waiter.modal()
                 
                 # Wait for modal to appear
-                modal_title = self.wait.until(EC.presence_of_element_located((By.XPATH, "//h2[contains(@class, 'artdeco-modal__header')]")))
-                print(f"Modal opened: {modal_title.text}")
+                modal_title = self.wait.until(EC.presence_of_element_located(self.selectors.get("modal_header")))
+                log.info("Modal opened: %s", modal_title.text)
 
                 # Check for "Add a note" button
-                add_note_button = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//button[span[text()='Add a note']]")))
+                add_note_button = self.wait.until(EC.element_to_be_clickable(self.selectors.get("add_note_button")))
                 
                 if message_note:
-                    print("Adding a note...")
+                    log.info("Adding a note...")
                     add_note_button.click()
                     self.random_sleep(1, 2)
                     
                     # Target the custom message text area
-                    text_area = self.driver.find_element(By.ID, "custom-message")
+                    text_area = self.driver.find_element(*self.selectors.get("note_textarea"))
                     text_area.send_keys(message_note)
                     self.random_sleep(1, 2)
                     
                     # The Send button in the modal
-                    send_button = self.driver.find_element(By.XPATH, "//button[span[text()='Send']]")
+                    send_button = self.driver.find_element(*self.selectors.get("modal_send"))
                     # send_button.click() # UI Only: Uncomment to actually send
-                    print(f"Would have clicked 'Send' with note: {message_note}")
-                    print("SECURITY: Not actually clicking send in demo mode. Uncomment line in code.")
+                    log.info("Would have clicked 'Send' with note: %s", message_note)
+                    log.warning("SECURITY: Not actually clicking send in demo mode. Uncomment line in code.")
                     # Close modal manually for demo (or click send)
-                    self.driver.find_element(By.XPATH, "//button[contains(@class, 'artdeco-modal__dismiss')]").click()
+                    self.driver.find_element(*self.selectors.get("modal_dismiss")).click()
 
                 else:
                     # Send without note
-                    send_button = self.driver.find_element(By.XPATH, "//button[span[text()='Send without a note']]")
+                    send_button = self.driver.find_element(*self.selectors.get("modal_send_without_note"))
                     # send_button.click()
-                    print("Would have clicked 'Send without note'")
+                    log.info("Would have clicked 'Send without note'")
                 
                 return True
             else:
-                print("Could not find Connect button. Already connected or button hidden?")
+                log.info("Could not find Connect button. Already connected or button hidden?")
                 return False
 
         except Exception as e:
-            print(f"Error sending connection request: {e}")
+            log.error("Error sending connection request: %s", e)
             return False
 
+    @timed("send_message")
     def send_message(self, profile_url, message):
         """
         Sends a message to an existing connection.
         """
-        if self.driver.current_url != profile_url:
-            self.driver.get(profile_url)
-            self.random_sleep(3, 5)
+        if not self.on_page(profile_url):
+            self.driver.get(self.site_url(profile_url))
+            self.waiter.page_ready(floor=(1, 2))
 
         try:
             # Look for "Message" button
-            message_button = self.driver.find_elements(By.XPATH, "//button[span[text()='Message']]")
+            message_button = self.driver.find_elements(*self.selectors.get("message_button"))
             if message_button: # Usually primary action if connected
                 message_button[0].click()
-                self.random_sleep(2, 4)
                 
                 # Wait for the chat window's message box
-                msg_box = self.wait.until(EC.presence_of_element_located((By.XPATH, "//div[@role='textbox' and @contenteditable='true']")))
+                msg_box = self.waiter.element(self.selectors.get("chat_textbox"), floor=(1, 2))
+                if not msg_box:
+                    log.warning("Message box did not open.")
+                    return False
                 
                 msg_box.click()
                 msg_box.send_keys(message)
                 self.random_sleep(1, 2)
                 
                 # Find the Send button in the chat overlay
-                send_btn = self.driver.find_element(By.XPATH, "//button[text()='Send']")
+                send_btn = self.driver.find_element(*self.selectors.get("chat_send"))
                 # send_btn.click() # UI Only
-                print(f"Would have sent message: {message}")
-                print("SECURITY: Not actually clicking send in demo mode.")
+                log.info("Would have sent message: %s", message)
+                log.warning("SECURITY: Not actually clicking send in demo mode.")
                 
                 # Close chat to clean up?
                 try:
-                    close_icon = self.driver.find_element(By.XPATH, "//button[contains(@class, 'msg-overlay-bubble-header__control--close-btn')]")
+                    close_icon = self.driver.find_element(*self.selectors.get("chat_close"))
                     close_icon.click()
                 except:
                     pass
 
                 return True
             else:
-                print("Message button not found.")
+                log.info("Message button not found.")
                 return False
                 
         except Exception as e:
-            print(f"Error sending message: {e}")
+            log.error("Error sending message: %s", e)
             return False
 
+    @timed("send_premium_message")
     def send_premium_message(self, profile_url, message_body, subject=None):
         """
         Tries to send a direct message (Premium/InMail).
         Supports Standard LinkedIn and Sales Navigator.
         """
-        if self.driver.current_url != profile_url:
-            self.driver.get(profile_url)
-            self.random_sleep(3, 5)
+        if not self.on_page(profile_url):
+            self.driver.get(self.site_url(profile_url))
+            self.waiter.page_ready(floor=(1, 2))
 
         try:
             is_sales_nav = "sales/people" in self.driver.current_url or "sales/profile" in self.driver.current_url
@@ -272,7 +461,7 @@ class LinkedInBot:
             
             # --- Button Strategy 1: Text Match (Universal) ---
             # Search for any button containing "Message"
-            buttons = self.driver.find_elements(By.XPATH, "//button[contains(., 'Message')]")
+            buttons = self.driver.find_elements(*self.selectors.get("message_button_any"))
             for btn in buttons:
                 if btn.is_displayed():
                     message_button = btn
@@ -281,40 +470,43 @@ class LinkedInBot:
             # --- Button Strategy 2: "More" Menu (Standard LinkedIn) ---
             if not message_button and not is_sales_nav:
                 # Check inside More menu just in case
-                more_bg = self.driver.find_elements(By.XPATH, "//button[contains(@aria-label, 'More actions')]")
+                more_bg = self.driver.find_elements(*self.selectors.get("more_actions"))
                 if more_bg:
                     more_bg[0].click()
                     self.random_sleep(1, 2)
-                    dropdown_msg = self.driver.find_elements(By.XPATH, "//div[contains(@class, 'artdeco-dropdown')]//div[span[text()='Message']]")
+                    dropdown_msg = self.driver.find_elements(*self.selectors.get("dropdown_message"))
                     if dropdown_msg:
                         message_button = dropdown_msg[0]
 
             if not message_button:
-                print("No 'Message' button found on profile.")
+                log.info("No 'Message' button found on profile.")
                 return False
 
-            print("Clicking Message button...")
-            message_button.click()
-            self.random_sleep(3, 5)
+            log.info("Clicking Message button...")
+            # Wait until the composer renders: subject input (InMail) or the message box,
+            # whichever comes first, instead of a fixed sleep plus a 15s subject timeout
+            with self.timings.span("open_composer") as span:
+                message_button.click()
+                if not self.waiter.element(self.selectors.get("composer_subject"), self.selectors.get("composer_body"), floor=(1, 2)):
+                    span["outcome"] = "timeout"
             
             # 2. Check for Subject Line (InMail)
             try:
-                # Wait for the modal/panel to appear, looking for subject input as indicator
-                subject_input = self.wait.until(EC.presence_of_element_located((By.XPATH, "//input[@name='subject']")))
+                subject_input = self.driver.find_element(*self.selectors.get("composer_subject"))
                 if subject:
-                    print(f"InMail detected. Setting subject: {subject}")
+                    log.info("InMail detected. Setting subject: %s", subject)
                     subject_input.clear()
                     subject_input.send_keys(subject)
                     self.random_sleep(1)
             except:
                  # Standard message/Sales Nav message does not always have a subject field
-                 print("No subject input detected (might be a standard message or sales nav).")
+                 log.info("No subject input detected (might be a standard message or sales nav).")
                  pass
 
             # 3. Enter Message Body
             try:
                 # Try contenteditable div first (Standard + some Sales Nav)
-                msg_box = self.wait.until(EC.presence_of_element_located((By.XPATH, "//div[@role='textbox' and @contenteditable='true'] | //textarea[@name='message']")))
+                msg_box = self.wait.until(EC.presence_of_element_located(self.selectors.get("composer_body")))
 
                 # Clear and Send Keys
                 if msg_box.tag_name == 'textarea':
@@ -327,18 +519,18 @@ class LinkedInBot:
                 self.random_sleep(2, 3)
 
                 # 4. click Send
-                send_btns = self.driver.find_elements(By.XPATH, "//button[text()='Send' or span[text()='Send']]") # Handles both button types
+                send_btns = self.driver.find_elements(*self.selectors.get("composer_send")) # Handles both button types
 
                 if send_btns and send_btns[0].is_enabled():
                     # send_btns[0].click() # Security: Commented out
-                    print("Would have clicked Send (Premium Message).")
+                    log.info("Would have clicked Send (Premium Message).")
                 else:
-                    print("Send button disabled or not found?")
+                    log.warning("Send button disabled or not found?")
                 
                 # Cleanup: Close chat window/modal
                 try:
                     # Try to find both chat bubble close and standard modal close
-                    close_icon = self.driver.find_element(By.XPATH, "//button[contains(@class, 'msg-overlay-bubble-header__control--close-btn') or contains(@class, 'artdeco-modal__dismiss')]")
+                    close_icon = self.driver.find_element(*self.selectors.get("composer_close"))
                     close_icon.click()
                 except:
                     pass
@@ -346,228 +538,359 @@ class LinkedInBot:
                 return True
 
             except Exception as e:
-                print(f"Error interacting with message box: {e}")
+                log.error("Error interacting with message box: %s", e)
                 return False
 
         except Exception as e:
-            print(f"Error in send_premium_message: {e}")
+            log.error("Error in send_premium_message: %s", e)
             return False
 
-    def scrape_search_results(self, search_url, output_file="data.csv"):
-        print(f"Starting scrape and outreach: {search_url}")
-        self.driver.get(search_url)
-        self.random_sleep(3, 5)
+    def extract_in_browser(self):
+        """
+        Extract the current search page with one execute_script call that returns
+        compact records. Returns None when the page_source path should be used instead.
+        """
+        with self.timings.span("extract_in_browser") as span:
+            try:
+                layout, containers, profiles, failed_html = browser_extraction.extract_in_browser(self.driver, self.selectors.layout)
+            except WebDriverException as e:
+                span["outcome"] = "error"
+                log.warning("In-browser extraction failed, falling back to page source: %s", e)
+                return None
+            span.update(layout=layout, containers=containers, records=len(profiles))
+            if not containers:
+                span["outcome"] = "empty"
+                return None
+        self.selectors.remember_layout(layout)
+
+        log.debug("Scraped %s raw containers (layout: %s).", containers, layout)
+        if failed_html:
+            log.warning("FAILED to find name tag in the first item.")
+            path = self.debug.capture("extraction_fail", failed_html, layout=layout, url=self.driver.current_url)
+            if path:
+                log.info("Saving failed item HTML to %s", path)
+        for profile in profiles:
+            log.debug("Extracted: %s | %s", profile.name, profile.url)
+        return profiles
+
+    def extract_page_source(self, page_count):
+        """
+        Pull page_source over WebDriver and parse it with BeautifulSoup.
+        Returns a generator of Profiles, or None if the page has no result containers.
+        """
+        with self.timings.span("page_source"):
+            page_source = self.driver.page_source
+        with self.timings.span("parse", parser=self.parser):
+            soup = make_soup(page_source, self.parser, search_page=True)
+            # Waterfall Strategy lives in extraction.py so saved pages can be parsed offline
+            layout, results = find_result_containers(soup, self.selectors.layout)
+
+        log.debug("Scraped %s raw containers (layout: %s).", len(results), layout)
+        self.selectors.remember_layout(layout)
+
+        if not results:
+            log.warning("No results found.")
+            path = self.debug.capture("page_source", page_source, page=page_count, url=self.driver.current_url)
+            if path:
+                log.info("Saving page source to %s", path)
+            soup.decompose()
+            return None
+
+        return self.stream_profiles(soup, layout, results, page_count)
+
+    def stream_profiles(self, soup, layout, results, page_count):
+        """Yield a Profile per result container as it is extracted, then free the parse tree"""
+        records = 0
+        # Only the time spent here counts as "extract", not what the consumer does between records
+        elapsed = 0.0
+        outcome = "error"
+        try:
+            start = time.perf_counter()
+            for i, result in enumerate(results):
+                try:
+                    log.debug("--- Parsing Item %s ---", i+1)
+                    profile = extract_profile(result, layout)
+                except Exception as e:
+                    log.warning("Error parsing item %s on page %s: %s", i+1, page_count, e)
+                    continue
+
+                # Debugging if no name found
+                if not profile:
+                    log.warning("FAILED to find name tag in this item.")
+                    if i == 0:
+                        path = self.debug.capture("extraction_fail", str(result), layout=layout, url=self.driver.current_url)
+                        if path:
+                            log.info("Saving failed item HTML to %s", path)
+                    continue
+
+                log.debug("Extracted: %s | %s", profile.name, profile.url)
+                if profile.url != "N/A":
+                    records += 1
+                    elapsed += time.perf_counter() - start
+                    yield profile
+                    start = time.perf_counter()
+            elapsed += time.perf_counter() - start
+            outcome = "ok"
+        finally:
+            # Nothing downstream holds a tag: the page's tree goes away before the next page loads
+            soup.decompose()
+            self.timings.record("extract", elapsed, outcome, layout=layout, containers=len(results), records=records)
+
+    def collect_leads(self, search_url, resume=True):
+        """
+        Stage 1: paginate the search and queue every extracted profile in the store.
+        No profile is opened, so a large search is collected at page speed.
+        Returns the number of newly queued leads.
+        """
+        log.info("Collecting leads: %s", search_url)
+        store = ResultsStore(self.results_db)
+
+        # Resume from the last finished page unless asked to start over
+        page_count = 0
+        start_url = search_url
+        checkpoint = store.get_checkpoint(search_url) if resume else None
+        if checkpoint:
+            page_count, start_url = checkpoint
+            log.info("Resuming after page %s: %s", page_count, start_url)
+        else:
+            store.clear_checkpoint(search_url)
+
+        with self.timings.span("navigate") as span:
+            self.driver.get(self.site_url(start_url))
+            self.waiter.page_ready(floor=(1, 2))
+            self.measure_page(span)
 
         is_sales_nav = "sales" in search_url
         if is_sales_nav:
-            print("Sales Navigator detected.")
+            log.info("Sales Navigator detected.")
         else:
-            print("Standard LinkedIn detected.")
-
-        page_count = 0
-        
-        # Open file once outside the loop
-        with open(output_file, mode='w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Name', 'Profile URL', 'Headline', 'Location', 'Status'])
+            log.info("Standard LinkedIn detected.")
 
+        queued = 0
+        try:
             while True:
                 page_count += 1
-                print(f"\nProcessing page {page_count}...")
+                log.info("Collecting page %s...", page_count)
                 
                 # Scroll down to load all results
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                self.random_sleep(3, 5)
-
-                profiles_on_page = []
+                with self.timings.span("scroll_load"):
+                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                    self.waiter.network_idle(floor=(1, 2))
 
                 # --- Unified Scraping Logic ---
-                print("Waiting for results to render (skipping skeletons)...")
-                try:
+                log.debug("Waiting for results to render (skipping skeletons)...")
+                with self.timings.span("wait_results") as span:
                     # Wait for ACTUAL content to load, not just the container skeletons
-                    # We wait for at least one profile link to appear
-                    WebDriverWait(self.driver, 15).until(
-                        lambda d: d.find_elements(By.XPATH, "//a[contains(@href, '/in/') and not(contains(@href, 'linkedin.com/in/'))]") or # Standard internal links
-                                  d.find_elements(By.XPATH, "//a[contains(@href, '/sales/people')]") or # Sales Nav links
-                                  d.find_elements(By.CSS_SELECTOR, "[data-view-name='search-result-lockup-title']") # New UI
-                    )
-                except Exception:
-                    print("Timeout waiting for actual profile data. Proceeding with page source check...")
-
-                # Re-parse page after wait
-                soup = BeautifulSoup(self.driver.page_source, "html.parser")
-                
-                # Waterfall Strategy: Try most specific/modern structures first
-                # 1. New UI / SDUI (Standard & Hybrid)
-                results = soup.find_all("div", {"data-view-name": "people-search-result"})
-                
-                # 2. Classic Standard UI
-                if not results:
-                    results = soup.find_all("li", {"class": "reusable-search__result-container"})
-                
-                # 3. Classic Sales Navigator (using lambda to check class substring)
-                if not results:
-                    results = soup.find_all("li", {"class": lambda x: x and "artdeco-list__item" in x})
-                
-                # 4. Generic Fallback
-                if not results:
-                    results = soup.find_all("div", {"role": "listitem"})
-
-                print(f"DEBUG: Scraped {len(results)} raw containers.")
-
-                if not results:
-                    print("No results found. Saving debug info...")
-                    with open("debug_page_source.html", "w", encoding="utf-8") as debug_f:
-                        debug_f.write(self.driver.page_source)
+                    # We wait for at least one profile link to appear: once the layout is known
+                    # only its selector is checked, otherwise every layout's, in one browser call
+                    ready = self.waiter.first_ready(self.selectors.candidates("results_ready"))
+                    span["layout"] = ready
+                    if not ready:
+                        span["outcome"] = "timeout"
+                        log.warning("Timeout waiting for actual profile data. Proceeding with page source check...")
+
+                profiles_on_page = None
+                if self.extraction_mode == "browser":
+                    profiles_on_page = self.extract_in_browser()
+                if profiles_on_page is None:
+                    profiles_on_page = self.extract_page_source(page_count)
+                if profiles_on_page is None:
+                    # An interstitial instead of results: stop, the checkpoint still points at this page
+                    self.check_page()
                     break # End loop if no results found
 
-                for i, result in enumerate(results):
-                    try:
-                        print(f"--- Parsing Item {i+1} ---")
-                        name = "Unknown"
-                        profile_url = "N/A"
-                        headline = "No Headline"
-                        location = "No Location"
-                        
-                        # --- Name & URL Extraction ---
-                        name_tag = None
-                        
-                        # Priority 1: New UI Title (Standard & Sales Nav Hybrid)
-                        name_tag = result.find("a", {"data-view-name": "search-result-lockup-title"})
-                        if name_tag: print("Found name via Priority 1 (search-result-lockup-title)")
-                        
-                        # Priority 2: Standard/Sales Name Link (app-aware-link)
-                        if not name_tag:
-                            # Search for the main profile link
-                            all_links = result.find_all("a")
-                            for link in all_links:
-                                href = link.get("href", "")
-                                text = link.get_text(strip=True)
-                                # Heuristic: Name links are usually not empty and link to profile
-                                if len(text) > 2 and ("/in/" in href or "/sales/people" in href):
-                                    # Avoid buttons/images
-                                    if "Connect" not in text and "Message" not in text:
-                                        name_tag = link
-                                        print(f"Found name via Priority 2 (Heuristic link): {text}")
-                                        break
-                        
-                        # Debugging if no name found
-                        if not name_tag:
-                            print("FAILED to find name tag in this item.")
-                            if i == 0:
-                                with open("debug_extraction_fail.html", "w", encoding="utf-8") as f:
-                                    f.write(result.prettify())
-                                print("Saved failed item HTML to debug_extraction_fail.html")
-
-                        if name_tag:
-                            # Clean up name
-                            name = name_tag.get_text(strip=True).split("\n")[0].strip() 
-                            href = name_tag.get("href")
-                            
-                            if href.startswith("/"):
-                                profile_url = f"https://www.linkedin.com{href.split('?')[0]}"
-                            else:
-                                profile_url = href.split('?')[0] if href else "N/A"
-                            
-                            # --- Headline & Location Extraction ---
-                            try:
-                                headline_tag = result.find("div", {"class": lambda x: x and ("entity-result__headline" in x or "search-result__snippet" in x)})
-                                if not headline_tag:
-                                     text_blocks = list(result.stripped_strings)
-                                     if len(text_blocks) > 2:
-                                         headline = text_blocks[2]
-                                else:
-                                    headline = headline_tag.get_text(strip=True)
-                            except:
-                                pass
-                            
-                            try:
-                                location_tag = result.find("div", {"class": lambda x: x and "entity-result__secondary-subtitle" in x})
-                                if not location_tag:
-                                     text_blocks = list(result.stripped_strings)
-                                     if len(text_blocks) > 3:
-                                         location = text_blocks[3]
-                                else:
-                                    location = location_tag.get_text(strip=True)
-                            except:
-                                pass
-                            
-                            print(f"Extracted: {name} | {profile_url}")
-                            if profile_url != "N/A":
-                                profiles_on_page.append({
-                                    "name": name,
-                                    "url": profile_url,
-                                    "headline": headline,
-                                    "location": location
-                                })
-                    except Exception as e:
-                        print(f"Error parsing item {i+1} on page {page_count}: {e}")
-
-
-                print(f"Found {len(profiles_on_page)} profiles. Starting interaction...")
-
-                # Process each profile
-                for p in profiles_on_page:
-                    status = "Skipped"
-                    if p['url'] and p['url'] != "N/A":
-                        # Open in new tab
-                        self.driver.execute_script(f"window.open('{p['url']}', '_blank');")
-                        self.driver.switch_to.window(self.driver.window_handles[-1])
-                        self.random_sleep(3, 5)
-                        
-                        # Format message
-                        msg = self.message_template
-                        first_name = p['name'].split()[0] if p['name'] else "there"
-                        msg = msg.format(first_name=first_name)
-                        
-                        print(f"visiting {p['name']}...")
-                        
-                        # Use updated sender which handles both Sales Nav and Standard
-                        sent_msg = self.send_premium_message(p['url'], message_body=msg, subject=self.message_subject)
-                        
-                        if sent_msg:
-                            status = "Premium Message Sent"
-                        else:
-                            # Fallback to connection request if message failed and profile URL suggests connection is possible
-                            # Note: This is an advanced fallback. For simplicity and safety, we mark as failed.
-                            status = "Message Failed / Connect Skipped"
-                        
-                        # Close current tab and switch back to search results
-                        self.driver.close()
-                        self.driver.switch_to.window(self.driver.window_handles[0])
-                        self.random_sleep(1, 3)
-                    
-                    # Write result to CSV
-                    writer.writerow([p['name'], p['url'], p['headline'], p['location'], status])
-                    f.flush()
+                # Records stream from the extractor straight into the queue
+                found, added = store.enqueue(profiles_on_page, search_url, page_count)
+                queued += added
+                self.timings.count("leads_queued", added)
+                self.timings.count("leads_already_queued", found - added)
+                log.info("Found %s profiles, %s new leads queued.", found, added)
                 
                 # Check for Next Button
                 try:
                     next_button = None
                     if is_sales_nav:
                         # Sales Nav next button often has class 'search-results__pagination-next-button'
-                        pagination = self.driver.find_elements(By.XPATH, "//button[contains(@class, 'search-results__pagination-next-button')]")
+                        pagination = self.driver.find_elements(*self.selectors.get("next_page", LAYOUT_SALES_NAV))
                         if pagination: next_button = pagination[0]
                     else:
                         # Standard
                         # Note: Look for the button with aria-label='Next' for general navigation
-                        next_button = self.driver.find_element(By.XPATH, "//button[@aria-label='Next']")
+                        next_button = self.driver.find_element(*self.selectors.get("next_page"))
 
                     if next_button and next_button.is_enabled():
-                        next_button.click()
-                        self.random_sleep(3, 6)
+                        with self.timings.span("next_page"):
+                            next_button.click()
+                            self.waiter.network_idle(floor=(1, 2))
+                        # Page queued: a restart can go straight to the next page
+                        store.set_checkpoint(search_url, page_count, self.canonical_url(self.driver.current_url))
                     else:
-                        print("Reached last page.")
+                        log.info("Reached last page.")
+                        store.clear_checkpoint(search_url)
                         break
                 except:
-                    print("No 'Next' button found, ending scrape.")
+                    log.info("No 'Next' button found, ending collection.")
+                    store.clear_checkpoint(search_url)
                     break
+        finally:
+            counts = store.lead_counts(search_url)
+            store.close()
+
+        log.info("Collection complete. %s new leads queued (queue for this search: %s).", queued, counts)
+        return queued
+
+    def process_leads(self, search_url=None, output_file="data.csv", limit=None, requeue=False):
+        """
+        Stage 2: visit queued leads (of one search, or all) and message them, paced.
+        Each lead is marked done with its result, so an interrupted run picks up
+        with the next pending lead; requeue re-runs already processed leads.
+        Returns the number of leads processed.
+        """
+        log.info("Processing queued leads%s", f" for {search_url}" if search_url else "")
+        store = ResultsStore(self.results_db)
+        seen = open_seen_index(self.dedup_index, self.dedup_mode)
+        breaker = self.breaker
+        breaker.reset()
+        exporter = None
+        if self.export_dir != "off":
+            exporter = PartitionedExporter(self.export_dir, self.timings.run_id, self.export_part_rows)
+        if requeue:
+            log.info("Re-queued %s processed leads.", store.requeue(search_url))
+
+        processed = 0
+        # Leads left pending after a blocking failure are not picked again in this run
+        deferred = set()
+        # Results go to the store as they are processed; data.csv is exported at the end
+        try:
+            while limit is None or processed < limit:
+                batch = store.pending_leads(search_url, limit=min(100, limit - processed) if limit else 100,
+                                            exclude=deferred)
+                if not batch:
+                    break
+
+                for p, lead_search_url, page in batch:
+                    processed += 1
+                    # Re-queued leads were processed before on purpose: the index would skip all of them
+                    if seen is not None and not requeue and seen.contains(p.url):
+                        log.info("Already processed %s in an earlier run, skipping.", p.name)
+                        self.timings.count("skipped_seen")
+                        store.finish_lead(p.url)
+                        continue
+
+                    status = "Skipped"
+                    if p.url and p.url != "N/A":
+                        status = self.visit_with_retries(p, breaker)
+                        if status is None:
+                            # Session blocked: leave the lead pending for the next run
+                            deferred.add(p.url)
+                            continue
+
+                        # Pacing between profiles
+                        self.random_sleep(1, 3)
+
+                        if seen is not None and status in FINAL_STATUSES:
+                            seen.add(p.url)
+                    
+                    store.record(p, status, lead_search_url, page)
+                    if status in FINAL_STATUSES or status == "Skipped":
+                        store.finish_lead(p.url)
+                    else:
+                        # Failed without a final answer: stays queued for the next run
+                        deferred.add(p.url)
+                    if exporter:
+                        exporter.write(p, status, lead_search_url, page)
+                    self.timings.count(f"status: {status}")
+                    if status != "Skipped":
+                        # Between leads the queue is the search position: a fresh browser just continues
+                        self.after_profile()
+
+                if seen is not None:
+                    seen.flush()
+        finally:
+            rows = store.export_csv(output_file, search_url)
+            counts = store.lead_counts(search_url)
+            store.close()
+            if seen is not None:
+                seen.close()
+            if exporter:
+                exporter.close()
+
+        log.info("Batch complete. %s leads processed, %s rows saved to %s (queue: %s)", processed, rows, output_file, counts)
+        return processed
+
+    def visit_lead(self, p):
+        """Open one lead's profile and message it. Raises BotFailure with the failure kind"""
+        with self.timings.span("open_profile") as span:
+            self.driver.get(self.site_url(p.url))
+            self.waiter.page_ready(floor=(1, 2))
+            self.measure_page(span)
+        # Interstitials are recognised before any button is searched for
+        self.check_page(expected=self.selectors.get("profile_name"))
         
-        print(f"Batch complete. Data saved to {output_file}")
+        log.info("visiting %s...", p.name)
+        
+        # Use updated sender which handles both Sales Nav and Standard
+        if not self.send_premium_message(p.url, message_body=self.message.render(p), subject=self.subject.render(p)):
+            # Still the profile page when there is no Message button: its own text is not an interstitial
+            self.check_page(expected=self.selectors.get("profile_name"))
+            raise BotFailure(failures.ELEMENT_MISSING, "no usable Message button")
+        return STATUS_SENT
+
+    def visit_with_retries(self, p, breaker):
+        """
+        visit_lead with the retry budget of each failure kind. Returns the lead's
+        status, or None if it failed on a blocking condition and should stay queued.
+        Raises CircuitOpen when blocking failures repeat.
+        """
+        attempt = 0
+        while True:
+            try:
+                status = self.visit_lead(p)
+                breaker.record(None)
+                return status
+            except (BotFailure, WebDriverException) as e:
+                kind = failures.classify_exception(e)
+                log.warning("Visit of %s failed (%s): %s", p.name, kind, e)
+
+            self.timings.count(f"failure: {kind}")
+            if breaker.record(kind):
+                raise CircuitOpen(kind, f"{breaker.threshold} blocking failures in the last {breaker.window} visits")
+
+            retries = failures.RETRY_POLICY.get(kind, (0, 0))[0]
+            if attempt >= retries:
+                if kind in failures.BLOCKING:
+                    return None
+                if kind == failures.ELEMENT_MISSING:
+                    # Fallback to connection request if message failed and profile URL suggests connection is possible
+                    # Note: This is an advanced fallback. For simplicity and safety, we mark as failed.
+                    return STATUS_NO_BUTTON
+                if kind == failures.NOT_FOUND:
+                    return STATUS_NOT_FOUND
+                return f"Failed ({kind})"
+
+            delay = failures.backoff(kind, attempt)
+            attempt += 1
+            log.info("Retrying %s in %.0fs (attempt %s/%s)...", p.name, delay, attempt, retries)
+            time.sleep(delay)
+            if kind == failures.SESSION_EXPIRED:
+                self.login()
+
+    def scrape_search_results(self, search_url, output_file="data.csv", resume=True):
+        """Both stages back to back: collect the whole search, then process its leads"""
+        log.info("Starting scrape and outreach: %s", search_url)
+        self.collect_leads(search_url, resume)
+        self.process_leads(search_url, output_file)
 
 
     def close(self):
+        # One run report covering every stage that ran
+        self.timings.print_summary()
+        self.memory.print_report()
         self.driver.quit()
+        self.debug.close()
+        if self.profile_cache:
+            self.profile_cache.close()
+        self.timings.close()
 
 if __name__ == "__main__":
     import argparse
@@ -576,18 +899,63 @@ if __name__ == "__main__":
     parser.add_argument("--url", help="Target Profile URL or Search Results URL")
     parser.add_argument("--message", help="Connection Note / Initial Message")
     parser.add_argument("--followup", help="Follow-up Message (if already connected)")
+    parser.add_argument("--dedup", choices=DEDUP_MODES, help="Cross-run profile dedup index: exact hashed set, Bloom filter or off")
+    parser.add_argument("--log-level", help="DEBUG for per-item traces (default: LINKEDIN_LOG_LEVEL or INFO)")
+    parser.add_argument("--log-json", action="store_true", help="Log one JSON object per line")
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint and start the search from page 1")
+    parser.add_argument("--replay", metavar="DIR", help="Run offline against captured pages served from DIR (see replay_server.py)")
+    parser.add_argument("--stage", choices=("all", "collect", "process"), default="all",
+                        help="Search pipeline stage: collect leads into the queue, process queued leads, or both")
+    parser.add_argument("--limit", type=int, help="Process at most this many queued leads")
+    parser.add_argument("--requeue", action="store_true", help="Process already processed leads again")
+    parser.add_argument("--headless", action="store_true", help="Run Chrome headless (LINKEDIN_HEADLESS)")
+    parser.add_argument("--block", metavar="TYPES", help=f"Resource types not to download, comma separated: {', '.join(page_weight.BLOCK_PATTERNS)} (LINKEDIN_BLOCK)")
+    parser.add_argument("--refresh", action="store_true", help="Scrape the profile again even if it is in the profile cache")
+    parser.add_argument("--lightweight", action="store_true", help=f"Headless and block {','.join(page_weight.LIGHTWEIGHT_BLOCK)}")
+    parser.add_argument("--profile", metavar="DIR", default=os.getenv("LINKEDIN_PROFILE_DIR"),
+                        help="Run login and the search stages under cProfile/tracemalloc, writing stats to DIR (LINKEDIN_PROFILE_DIR)")
     
     args = parser.parse_args()
+    setup_logging(args.log_level, "json" if args.log_json else None)
+
+    if args.headless or args.lightweight:
+        os.environ["LINKEDIN_HEADLESS"] = "1"
+    if args.block is not None:
+        os.environ["LINKEDIN_BLOCK"] = args.block
+    elif args.lightweight:
+        os.environ["LINKEDIN_BLOCK"] = ",".join(page_weight.LIGHTWEIGHT_BLOCK)
+
+    output_file = "data.csv"
+    replay = None
+    if args.replay:
+        # Offline run: captured pages from a local server, results kept apart from real runs.
+        # Assigned outright: values from .env point at the real stores, which replayed
+        # profiles (stored under linkedin.com URLs) must never reach
+        replay = start_replay_server(args.replay)
+        os.environ["LINKEDIN_BASE_URL"] = replay.base_url
+        os.environ["LINKEDIN_RESULTS_DB"] = "replay_results.db"
+        os.environ["LINKEDIN_DEDUP_MODE"] = "off"
+        os.environ["LINKEDIN_DEDUP_INDEX"] = "replay_seen_profiles"  # in case --dedup turns it on
+        os.environ["LINKEDIN_PROFILE_CACHE"] = "replay_profile_cache.db"
+        os.environ["LINKEDIN_EXPORT_DIR"] = "replay_exports"
+        output_file = "replay_data.csv"
 
     bot = LinkedInBot()
+    if args.dedup:
+        bot.dedup_mode = args.dedup
+    profiler = RunProfiler(args.profile, bot.timings.run_id)
     try:
-        bot.login()
+        with profiler.profile("login"):
+            bot.login()
         
         default_url = bot.env_search_url if bot.env_search_url else ""
         if default_url:
-            print(f"Found LINKEDIN_SEARCH_URL in .env: {default_url}")
+            log.info("Found LINKEDIN_SEARCH_URL in .env: %s", default_url)
 
-        if args.url:
+        if args.stage == "process" and not args.url:
+            # Work through every queued lead, whichever search collected it
+            target_url = None
+        elif args.url:
             target_url = args.url
         elif default_url:
             use_env = input(f"Use Search URL from .env? (y/n) [y]: ").lower()
@@ -599,29 +967,40 @@ if __name__ == "__main__":
             target_url = input("Enter the LinkedIn URL (Profile OR Search Results): ")
         
         # Check if it is a Search URL or a Profile URL
-        if "linkedin.com/search/results" in target_url or "linkedin.com/sales/search" in target_url:
-            print("Detected Search URL. Switching to Search Scraping Mode.")
-            bot.scrape_search_results(target_url, output_file="data.csv")
+        if target_url is None or "linkedin.com/search/results" in target_url or "linkedin.com/sales/search" in target_url:
+            log.info("Detected Search URL. Switching to Search Scraping Mode.")
+            if args.stage in ("all", "collect"):
+                with profiler.profile("collect"):
+                    bot.collect_leads(target_url, resume=not args.restart)
+            if args.stage in ("all", "process"):
+                with profiler.profile("process"):
+                    bot.process_leads(target_url, output_file=output_file, limit=args.limit, requeue=args.requeue)
         else:
             # Assume it's a single profile interaction
             initial_message = args.message if args.message else input("Enter the connection note message: ")
             
             # Scrape
-            data = bot.scrape_profile(target_url)
+            data = bot.scrape_profile(target_url, refresh=args.refresh)
             
             # Connect
             connected = bot.send_connection_request(target_url, initial_message)
             
             if not connected:
-                print("Could not connect (maybe already connected?). Attempting to send message directly...")
+                log.info("Could not connect (maybe already connected?). Attempting to send message directly...")
                 followup = args.followup if args.followup else input("Enter follow-up message (or press Enter to skip): ")
                 if followup:
                     bot.send_message(target_url, followup)
             
+    except BotFailure as e:
+        # Queue and checkpoints are already saved: the next run resumes where this one stopped
+        log.error("Run stopped (%s): %s. Progress is saved, re-run to resume.", e.kind, e)
     except ValueError as e:
-        print(f"Configuration Error: {e}")
+        log.error("Configuration Error: %s", e)
     except Exception as e:
-        print(f"An unexpected error occurred: {e}")
+        log.error("An unexpected error occurred: %s", e)
     finally:
         bot.close() # Now safely quitting the browser
-        print("Done. Driver has been closed.")
\ No newline at end of file
+        if replay:
+            replay.shutdown()
+        profiler.print_report()
+        log.info("Done. Driver has been closed.")
\ No newline at end of file
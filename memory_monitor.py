@@ -0,0 +1,122 @@
+"""
+Memory sampling and browser recycling for long runs.
+
+After every processed profile the bot samples memory: Chrome (chromedriver's
+whole process tree, RSS), the Python process (RSS) and the page's JS heap.
+Samples go to timings.jsonl as "memory" events and a memory-over-time table
+is logged when the bot closes.
+
+RecyclePolicy restarts the browser after max_profiles profiles or once Chrome
+uses more than max_browser_mb, so per-profile latency stays flat on long runs.
+psutil is optional: without it only the JS heap and Python's peak RSS are known,
+and recycling falls back to the profile count.
+"""
+import time
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from bot_logging import get_logger
+
+log = get_logger("memory")
+
+MB = 1024 * 1024
+JS_HEAP_SCRIPT = "return performance.memory ? performance.memory.usedJSHeapSize : null"
+
+
+def browser_rss_mb(driver):
+    """RSS of chromedriver and every Chrome process it started, or None without psutil"""
+    if not HAS_PSUTIL:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return None
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / MB
+
+
+def python_rss_mb():
+    if HAS_PSUTIL:
+        return psutil.Process().memory_info().rss / MB
+    if resource:
+        # Peak, not current; kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return None
+
+
+class RecyclePolicy:
+    def __init__(self, max_profiles=200, max_browser_mb=1500):
+        """0 disables a limit"""
+        self.max_profiles = max_profiles
+        self.max_browser_mb = max_browser_mb
+
+    def check(self, profiles, browser_mb):
+        """Reason to restart the browser now, or None"""
+        if self.max_profiles and profiles >= self.max_profiles:
+            return f"{profiles} profiles"
+        if self.max_browser_mb and browser_mb and browser_mb >= self.max_browser_mb:
+            return f"browser at {browser_mb:.0f} MB"
+        return None
+
+
+class MemoryMonitor:
+    def __init__(self, timings):
+        self.timings = timings
+        self.start = time.monotonic()
+        self.samples = []
+        self.profiles = 0
+        self.restarts = 0
+
+    def sample(self, driver):
+        """Record memory after a profile; returns the sample"""
+        self.profiles += 1
+        try:
+            heap = driver.execute_script(JS_HEAP_SCRIPT)
+        except Exception:
+            heap = None
+        sample = {
+            "profiles": self.profiles,
+            "elapsed": round(time.monotonic() - self.start, 1),
+            "browser_mb": browser_rss_mb(driver),
+            "python_mb": python_rss_mb(),
+            "js_heap_mb": heap / MB if heap else None,
+            "restarts": self.restarts,
+        }
+        self.samples.append(sample)
+        self.timings.emit({"step": "memory", **{k: round(v, 1) if isinstance(v, float) else v
+                                                for k, v in sample.items()}})
+        return sample
+
+    def print_report(self, rows=10):
+        """Memory over time: about `rows` evenly spaced samples plus the last one"""
+        if not self.samples:
+            return
+        step = max(1, len(self.samples) // rows)
+        picked = self.samples[::step]
+        if picked[-1] is not self.samples[-1]:
+            picked.append(self.samples[-1])
+
+        def mb(value):
+            return f"{value:>10.0f}" if value is not None else f"{'-':>10}"
+
+        lines = [f"--- Memory over time ({self.restarts} browser restarts) ---",
+                 f"{'profiles':>8} {'elapsed s':>10} {'chrome MB':>10} {'python MB':>10} {'js heap MB':>10}"]
+        for s in picked:
+            lines.append(f"{s['profiles']:>8} {s['elapsed']:>10.0f} {mb(s['browser_mb'])} "
+                         f"{mb(s['python_mb'])} {mb(s['js_heap_mb'])}")
+        log.info("\n".join(lines), extra={"memory": picked})
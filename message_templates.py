@@ -0,0 +1,135 @@
+"""
+Message templates, compiled once at startup.
+
+LINKEDIN_MESSAGE / LINKEDIN_SUBJECT use str.format placeholders taken from the
+extracted record:
+
+    {first_name}  first word of the name ("there" if unknown)
+    {name}        full name
+    {headline}    headline ("" if not extracted)
+    {location}    location ("" if not extracted)
+
+Unknown fields, positional/indexed placeholders and unbalanced braces raise
+TemplateError when the bot starts instead of in the middle of a run.
+
+Dry run, no browser: render every row of a results CSV (data.csv layout).
+
+    python message_templates.py data.csv                      # LINKEDIN_MESSAGE / LINKEDIN_SUBJECT from .env
+    python message_templates.py data.csv --message "Hi {first_name}" --output rendered.csv
+"""
+import string
+
+from extraction import Profile
+
+TEMPLATE_FIELDS = ("first_name", "name", "headline", "location")
+
+# Placeholder values of an empty Profile are rendered as ""
+EMPTY = Profile()
+SAMPLE = Profile(name="Sample Name", headline="Sample Headline", location="Sample Location")
+
+
+class TemplateError(ValueError):
+    pass
+
+
+def profile_fields(profile):
+    """Template values for a Profile"""
+    name = (profile.name or "").strip()
+    if name == EMPTY.name:
+        name = ""
+    return {
+        "first_name": name.split()[0] if name else "there",
+        "name": name,
+        "headline": profile.headline if profile.headline not in (None, EMPTY.headline) else "",
+        "location": profile.location if profile.location not in (None, EMPTY.location) else "",
+    }
+
+
+class MessageTemplate:
+    def __init__(self, text, label="template"):
+        self.text = text
+        self.label = label
+        self.fields = []
+        # [(literal text, field name or None, format spec)], rendered with one join
+        self.parts = []
+        try:
+            parsed = list(string.Formatter().parse(text))
+        except ValueError as e:
+            raise TemplateError(f"{label}: {e}") from None
+        for literal, field, spec, conversion in parsed:
+            if field is None:
+                self.parts.append((literal, None, ""))
+                continue
+            if field not in TEMPLATE_FIELDS:
+                raise TemplateError(f"{label}: unknown placeholder {{{field}}}. "
+                                    f"Available: {', '.join('{' + f + '}' for f in TEMPLATE_FIELDS)}")
+            if conversion or (spec and "{" in spec):
+                raise TemplateError(f"{label}: conversions and nested fields are not supported in {{{field}}}")
+            self.fields.append(field)
+            self.parts.append((literal, field, spec))
+        # Format specs are only checked when applied: render once so "{first_name:d}" fails here
+        for sample in (SAMPLE, EMPTY):
+            try:
+                self.render(sample)
+            except (ValueError, TypeError) as e:
+                raise TemplateError(f"{label}: {e}") from None
+
+    def render(self, profile):
+        values = profile_fields(profile)
+        return "".join(literal + (format(values[field], spec) if field else "")
+                       for literal, field, spec in self.parts)
+
+
+if __name__ == "__main__":
+    import argparse
+    import csv
+    import os
+    import sys
+    import time
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    arg_parser = argparse.ArgumentParser(description="Render messages for every row of a results CSV, without a browser")
+    arg_parser.add_argument("results", help="Results CSV (Name, Profile URL, Headline, Location columns)")
+    arg_parser.add_argument("--message", default=os.getenv("LINKEDIN_MESSAGE", "Hi {first_name}, I hope this finds you well."))
+    arg_parser.add_argument("--subject", default=os.getenv("LINKEDIN_SUBJECT", "Hello"))
+    arg_parser.add_argument("--output", help="Write rendered messages to this CSV (default: stdout)")
+    arg_parser.add_argument("--max-length", type=int, help="Report messages longer than this many characters")
+    args = arg_parser.parse_args()
+
+    try:
+        message = MessageTemplate(args.message, "message")
+        subject = MessageTemplate(args.subject, "subject")
+    except TemplateError as e:
+        print(f"Template error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    start = time.perf_counter()
+    with open(args.results, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    profiles = [Profile(name=row.get("Name") or EMPTY.name, url=row.get("Profile URL") or EMPTY.url,
+                        headline=row.get("Headline") or EMPTY.headline, location=row.get("Location") or EMPTY.location)
+                for row in rows]
+    rendered = [(p, subject.render(p), message.render(p)) for p in profiles]
+    elapsed = time.perf_counter() - start
+
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        writer = csv.writer(out)
+        writer.writerow(["Name", "Profile URL", "Subject", "Message"])
+        for p, subject_text, message_text in rendered:
+            writer.writerow([p.name, p.url, subject_text, message_text])
+    finally:
+        if args.output:
+            out.close()
+
+    lengths = [len(text) for _, _, text in rendered]
+    print(f"{len(rendered)} messages rendered in {elapsed * 1000:.1f} ms"
+          + (f", length {min(lengths)}-{max(lengths)} chars" if lengths else ""), file=sys.stderr)
+    fallback = sum(1 for p in profiles if not profile_fields(p)["name"])
+    if fallback:
+        print(f"{fallback} rows without a name (first_name rendered as 'there')", file=sys.stderr)
+    if args.max_length:
+        too_long = [p.url for (p, _, text) in rendered if len(text) > args.max_length]
+        print(f"{len(too_long)} messages longer than {args.max_length} chars", file=sys.stderr)
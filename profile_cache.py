@@ -0,0 +1,124 @@
+"""
+Persistent cache of scraped profile data.
+
+scrape_profile() results are stored in SQLite keyed by the normalized profile
+URL (dedup.dedup_key: no query string, no trailing slash, case folded), so a
+profile fetched recently is served without a browser round-trip. Entries
+expire after ttl seconds; beyond max_entries the least recently used ones
+are evicted.
+
+    python profile_cache.py get https://www.linkedin.com/in/someone/
+    python profile_cache.py export profiles.csv        # fresh entries only, --all for every entry
+"""
+import csv
+import json
+import sqlite3
+import time
+
+from dedup import dedup_key
+from extraction import normalize_profile_url
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    key TEXT PRIMARY KEY,
+    url TEXT,
+    data TEXT,
+    fetched_at REAL,
+    accessed_at REAL
+);
+CREATE INDEX IF NOT EXISTS profiles_by_access ON profiles (accessed_at);
+"""
+
+
+class ProfileCache:
+    def __init__(self, path="profile_cache.db", ttl=24 * 3600, max_entries=5000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def get(self, url):
+        """Cached data dict for url, or None if missing or older than ttl"""
+        key = dedup_key(url)
+        row = self.conn.execute("SELECT data, fetched_at FROM profiles WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        data, fetched_at = row
+        if time.time() - fetched_at > self.ttl:
+            return None
+        # Recency for LRU eviction; committed with the next put or on close
+        self.conn.execute("UPDATE profiles SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return json.loads(data)
+
+    def put(self, url, data):
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO profiles (key, url, data, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (dedup_key(url), normalize_profile_url(url), json.dumps(data), now, now),
+        )
+        self.evict()
+        self.conn.commit()
+
+    def evict(self):
+        """Drop the least recently used entries beyond max_entries"""
+        self.conn.execute(
+            "DELETE FROM profiles WHERE key IN ("
+            "SELECT key FROM profiles ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def entries(self, include_expired=False):
+        """(url, data, fetched_at) rows, most recently fetched first"""
+        query = "SELECT url, data, fetched_at FROM profiles"
+        params = ()
+        if not include_expired:
+            query += " WHERE fetched_at >= ?"
+            params = (time.time() - self.ttl,)
+        for url, data, fetched_at in self.conn.execute(query + " ORDER BY fetched_at DESC", params):
+            yield url, json.loads(data), fetched_at
+
+    def export_csv(self, output_file, include_expired=False):
+        """Write cached profiles to CSV without touching the browser; returns the row count"""
+        rows = list(self.entries(include_expired))
+        fields = sorted({field for _, data, _ in rows for field in data})
+        with open(output_file, mode='w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Profile URL', *fields, 'Fetched At'])
+            for url, data, fetched_at in rows:
+                writer.writerow([url, *(data.get(field, "") for field in fields),
+                                 time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(fetched_at))])
+        return len(rows)
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    arg_parser = argparse.ArgumentParser(description="Inspect or export the profile cache")
+    arg_parser.add_argument("--cache", default=os.getenv("LINKEDIN_PROFILE_CACHE", "profile_cache.db"), help="Cache file")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    get_cmd = commands.add_parser("get", help="Print the cached data of one profile")
+    get_cmd.add_argument("url")
+    export_cmd = commands.add_parser("export", help="Write cached profiles to CSV")
+    export_cmd.add_argument("output_file")
+    export_cmd.add_argument("--all", action="store_true", help="Include entries older than the TTL")
+    args = arg_parser.parse_args()
+
+    cache = ProfileCache(args.cache, ttl=float(os.getenv("LINKEDIN_PROFILE_CACHE_TTL", 24 * 3600)))
+    try:
+        if args.command == "get":
+            data = cache.get(args.url)
+            print(json.dumps(data, indent=2) if data is not None else "Not cached (or expired).")
+        else:
+            count = cache.export_csv(args.output_file, include_expired=args.all)
+            print(f"{count} profiles written to {args.output_file}")
+    finally:
+        cache.close()
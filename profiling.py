@@ -0,0 +1,73 @@
+"""
+Opt-in profiling of a bot run (--profile DIR or LINKEDIN_PROFILE_DIR).
+
+Each profiled step (login, collect, process) runs under cProfile and
+tracemalloc and leaves two files per run in DIR:
+
+    <run>-<step>.pstats        python -m pstats DIR/<file>  (or snakeviz)
+    <run>-<step>.tracemalloc   tracemalloc.Snapshot.load(path)
+
+On exit the hottest functions (cumulative time, all steps combined) and the
+largest allocation sites are logged, which shows whether parsing, WebDriver
+round-trips or sleeps dominate. Without a directory every hook is a no-op.
+"""
+import cProfile
+import io
+import os
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+
+from bot_logging import get_logger
+
+log = get_logger("profiling")
+
+
+class RunProfiler:
+    def __init__(self, directory=None, run_id="run", top=15):
+        self.directory = directory
+        self.run_id = run_id
+        self.top = top
+        self.stats_files = []
+        self.snapshots = []
+
+    @contextmanager
+    def profile(self, step):
+        if not self.directory:
+            yield
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            base = os.path.join(self.directory, f"{self.run_id}-{step}")
+            profiler.dump_stats(base + ".pstats")
+            snapshot.dump(base + ".tracemalloc")
+            self.stats_files.append(base + ".pstats")
+            self.snapshots.append((step, snapshot))
+
+    def print_report(self):
+        if not self.stats_files:
+            return
+        out = io.StringIO()
+        stats = pstats.Stats(*self.stats_files, stream=out)
+        stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        lines = [f"--- Profile ({self.run_id}): top {self.top} by cumulative time ---", out.getvalue().strip()]
+
+        for step, snapshot in self.snapshots:
+            lines.append(f"--- Largest allocations still held at the end of '{step}' ---")
+            snapshot = snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+            for stat in snapshot.statistics("lineno")[:self.top]:
+                frame = stat.traceback[0]
+                lines.append(f"{stat.size / 1024:>10.1f} KB {stat.count:>7} blocks  {frame.filename}:{frame.lineno}")
+        lines.append(f"pstats and tracemalloc snapshots written to {self.directory}")
+        log.info("\n".join(lines))
@@ -0,0 +1,212 @@
+"""
+Local stand-in for linkedin.com that serves captured pages.
+
+    python replay_server.py replay/ --port 8765
+    LINKEDIN_BASE_URL=http://127.0.0.1:8765 python linkedin_bot.py --url "<search url>"
+    python linkedin_bot.py --replay replay/ --url "<search url>"    # server started in-process
+
+Capture directory layout (only search/ is required):
+
+    search/page1.html, page2.html, ...   any search URL (standard or Sales Nav), by its page= parameter
+    profiles/<slug>.html                 /in/<slug>/ and /sales/lead/<slug>
+    profile.html                         fallback for profiles without their own capture
+    modal.html                           composer shown when a Message button is clicked
+    feed.html, login.html                optional, minimal stand-ins are served otherwise
+
+Captured <script> tags are stripped and a Content-Security-Policy only allows
+this server, so nothing is fetched from LinkedIn's CDNs. A small injected
+script turns the Next button into page=N+1 navigation (disabled on the last
+captured page) and opens/closes the composer. Send clicks are commented out in
+the bot, so a replay run never sends anything.
+"""
+import argparse
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from bot_logging import get_logger, setup_logging
+
+log = get_logger("replay")
+
+SCRIPT_TAG = re.compile(r"<script\b.*?</script\s*>", re.IGNORECASE | re.DOTALL)
+BODY_END = re.compile(r"</body\s*>", re.IGNORECASE)
+SEARCH_PATHS = ("/search/results/", "/sales/search/")
+PROFILE_PATH = re.compile(r"^/(?:in|sales/lead|sales/people)/([^/?#]+)")
+CSP = ("default-src 'self'; script-src 'self' 'unsafe-inline'; "
+       "style-src 'self' 'unsafe-inline'; img-src 'self' data:")
+
+FEED_PAGE = """<!DOCTYPE html>
+<html><head><title>Feed | Replay</title></head>
+<body><nav id="global-nav">Replay</nav><main>Feed</main></body></html>"""
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>Login | Replay</title></head>
+<body><form action="/login-submit" method="post">
+<input id="username" name="session_key"><input id="password" name="session_password" type="password">
+<button type="submit">Sign in</button></form></body></html>"""
+
+PROFILE_PAGE = """<!DOCTYPE html>
+<html><head><title>{name} | Replay</title></head>
+<body><nav id="global-nav">Replay</nav><main><h1>{name}</h1>
+<div class="text-body-medium">Replayed profile</div><button type="button">Message</button></main></body></html>"""
+
+MODAL = """<div role="dialog" class="artdeco-modal">
+<input name="subject"><div role="textbox" contenteditable="true"></div>
+<button type="button">Send</button><button type="button" class="artdeco-modal__dismiss">Dismiss</button>
+</div>"""
+
+NOT_FOUND_PAGE = "<!DOCTYPE html><html><body><h1>Not captured</h1></body></html>"
+
+# Next button -> next captured page, Message -> composer, dismiss -> close it
+REPLAY_SCRIPT = """<script>
+(() => {
+    const nextUrl = %(next_url)s;
+    const modalHtml = %(modal)s;
+    const NEXT = "button[aria-label='Next'], button.search-results__pagination-next-button";
+    const CLOSE = ".artdeco-modal__dismiss, .msg-overlay-bubble-header__control--close-btn";
+    const disableLast = () => document.querySelectorAll(NEXT).forEach(b => { b.disabled = !nextUrl; });
+    if (document.readyState === 'loading') document.addEventListener('DOMContentLoaded', disableLast);
+    else disableLast();
+    document.addEventListener('click', e => {
+        const button = e.target.closest('button');
+        if (!button) return;
+        if (button.matches(NEXT)) {
+            if (nextUrl) location.href = nextUrl;
+        } else if (button.matches(CLOSE)) {
+            const dialog = button.closest("[role='dialog']");
+            if (dialog) dialog.remove();
+        } else if (modalHtml && button.textContent.includes('Message') && !button.closest("[role='dialog']")) {
+            document.body.insertAdjacentHTML('beforeend', modalHtml);
+        } else {
+            return;
+        }
+        e.preventDefault();
+        e.stopPropagation();
+    }, true);
+})();
+</script>"""
+
+
+def script_literal(value):
+    """JSON literal that is safe to embed inside a <script> element"""
+    return json.dumps(value).replace("</", "<\\/")
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    server_version = "LinkedInReplay/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path.startswith(SEARCH_PATHS):
+            self.serve_search(url)
+        elif PROFILE_PATH.match(url.path):
+            self.serve_profile(PROFILE_PATH.match(url.path).group(1))
+        elif url.path.rstrip("/") in ("", "/feed"):
+            self.send_html(self.server.read("feed.html") or FEED_PAGE)
+        elif url.path.rstrip("/") == "/login":
+            self.send_html(self.server.read("login.html") or LOGIN_PAGE)
+        else:
+            self.send_html(NOT_FOUND_PAGE, status=404)
+
+    def do_POST(self):
+        # The stand-in login form: any credentials are accepted
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.send_response(303)
+        self.send_header("Location", "/feed/")
+        self.end_headers()
+
+    def serve_search(self, url):
+        query = dict(parse_qsl(url.query, keep_blank_values=True))
+        try:
+            page = max(1, int(query.get("page", 1)))
+        except ValueError:
+            page = 1
+        html = self.server.read(os.path.join("search", f"page{page}.html"))
+        if html is None:
+            self.send_html(NOT_FOUND_PAGE, status=404)
+            return
+        next_url = None
+        if self.server.exists(os.path.join("search", f"page{page + 1}.html")):
+            query["page"] = str(page + 1)
+            next_url = f"{url.path}?{urlencode(query)}"
+        self.send_html(html, next_url=next_url)
+
+    def serve_profile(self, slug):
+        slug = os.path.basename(slug)
+        html = self.server.read(os.path.join("profiles", f"{slug}.html")) or self.server.read("profile.html")
+        if html is None:
+            html = PROFILE_PAGE.format(name=slug.replace("-", " ").title())
+        self.send_html(html, modal=self.server.read("modal.html") or MODAL)
+
+    def send_html(self, html, status=200, next_url=None, modal=None):
+        html = SCRIPT_TAG.sub("", html)
+        script = REPLAY_SCRIPT % {"next_url": script_literal(next_url), "modal": script_literal(modal)}
+        html, found = BODY_END.subn(lambda m: script + m.group(0), html, count=1)
+        if not found:
+            html += script
+        body = html.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Content-Security-Policy", CSP)
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log.debug("%s " + format, self.address_string(), *args)
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, directory, host="127.0.0.1", port=0):
+        self.directory = os.path.abspath(directory)
+        if not os.path.isdir(os.path.join(self.directory, "search")):
+            raise ValueError(f"No search/ captures in replay directory: {self.directory}")
+        super().__init__((host, port), ReplayHandler)
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def exists(self, relative_path):
+        return os.path.isfile(os.path.join(self.directory, relative_path))
+
+    def read(self, relative_path):
+        """Captured page as text, or None if it was not captured"""
+        try:
+            with open(os.path.join(self.directory, relative_path), encoding="utf-8", errors="replace") as f:
+                return f.read()
+        except OSError:
+            return None
+
+
+def start_replay_server(directory, host="127.0.0.1", port=0):
+    """Serve the captures from a daemon thread; port 0 picks a free port"""
+    server = ReplayServer(directory, host, port)
+    threading.Thread(target=server.serve_forever, name="replay-server", daemon=True).start()
+    log.info("Replaying %s at %s", server.directory, server.base_url)
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve captured LinkedIn pages for offline runs")
+    parser.add_argument("directory", help="Capture directory (see module docstring for the layout)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    setup_logging()
+
+    server = ReplayServer(args.directory, args.host, args.port)
+    log.info("Replaying %s at %s (Ctrl+C to stop)", server.directory, server.base_url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,255 @@
+"""
+Partitioned export of run results and streaming summaries over them.
+
+Every processed lead is appended to a gzip CSV partition as it is recorded:
+
+    <dir>/<YYYY-MM-DD>/<run id>-<part>.csv.gz      rolled every part_rows rows
+    <dir>/index.jsonl                              one line per closed partition
+
+An index line carries the partition's row count, status counts and, per search
+layout, how many rows had a name, headline and location extracted. A summary
+merges those lines without opening the partitions; only partitions missing from
+the index (a run that was killed) are streamed row by row. Memory use depends
+on the number of distinct statuses and layouts, not on the number of rows.
+
+    python results_export.py summary exports
+    python results_export.py summary exports --rescan          # ignore the index, stream every partition
+    python results_export.py backfill results.db exports       # export rows recorded before live exports began
+"""
+import csv
+import gzip
+import json
+import os
+import time
+import zlib
+
+from extraction import Profile
+
+EXPORT_HEADER = ['Name', 'Profile URL', 'Headline', 'Location', 'Status', 'Layout',
+                 'Search URL', 'Page', 'Recorded At', 'Run']
+INDEX_FILE = "index.jsonl"
+# Fields counted as extracted when they differ from the Profile defaults
+EXTRACTED_FIELDS = ("name", "headline", "location")
+EMPTY = Profile()
+RECORDED_AT_FORMAT = "%Y-%m-%d %H:%M:%S"
+BACKFILL_PREFIX = "backfill-"
+
+
+class PartitionStats:
+    """Status counts and per-layout extraction counts of a set of rows"""
+
+    def __init__(self, rows=0, status=None, layout=None):
+        self.rows = rows
+        self.status = dict(status or {})
+        # layout -> {"rows": n, "name": n, "headline": n, "location": n}
+        self.layout = {name: dict(counts) for name, counts in (layout or {}).items()}
+
+    def add(self, status, layout, name, headline, location):
+        self.rows += 1
+        self.status[status] = self.status.get(status, 0) + 1
+        counts = self.layout.setdefault(layout or "unknown", dict.fromkeys(("rows",) + EXTRACTED_FIELDS, 0))
+        counts["rows"] += 1
+        for field, value in zip(EXTRACTED_FIELDS, (name, headline, location)):
+            if value and value != getattr(EMPTY, field):
+                counts[field] += 1
+
+    def merge(self, other):
+        self.rows += other.rows
+        for status, n in other.status.items():
+            self.status[status] = self.status.get(status, 0) + n
+        for name, counts in other.layout.items():
+            mine = self.layout.setdefault(name, dict.fromkeys(counts, 0))
+            for key, n in counts.items():
+                mine[key] = mine.get(key, 0) + n
+
+    def to_dict(self):
+        return {"rows": self.rows, "status": self.status, "layout": self.layout}
+
+
+class PartitionedExporter:
+    def __init__(self, directory="exports", run_id="run", part_rows=50000):
+        self.directory = directory
+        self.run_id = run_id
+        self.part_rows = part_rows
+        self.part = 0
+        self.file = None
+        self.writer = None
+        self.path = None
+        self.stats = None
+        self.exported = 0
+
+    def _open_part(self):
+        day = time.strftime("%Y-%m-%d")
+        os.makedirs(os.path.join(self.directory, day), exist_ok=True)
+        self.path = os.path.join(self.directory, day, f"{self.run_id}-{self.part:05d}.csv.gz")
+        self.file = gzip.open(self.path, "wt", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(EXPORT_HEADER)
+        self.stats = PartitionStats()
+
+    def _close_part(self):
+        """Close the open partition and add its line to the index"""
+        if not self.file:
+            return
+        self.file.close()
+        entry = {"path": os.path.relpath(self.path, self.directory), "run": self.run_id,
+                 "closed_at": time.time(), **self.stats.to_dict()}
+        with open(os.path.join(self.directory, INDEX_FILE), "a", encoding="utf-8") as index:
+            index.write(json.dumps(entry) + "\n")
+        self.file = None
+        self.part += 1
+
+    def write(self, profile, status, search_url=None, page=None, recorded_at=None):
+        if not self.file:
+            self._open_part()
+        self.writer.writerow([profile.name, profile.url, profile.headline, profile.location, status, profile.layout,
+                              search_url or "", page if page is not None else "",
+                              time.strftime(RECORDED_AT_FORMAT, time.localtime(recorded_at)), self.run_id])
+        self.stats.add(status, profile.layout, profile.name, profile.headline, profile.location)
+        self.exported += 1
+        if self.stats.rows >= self.part_rows:
+            self._close_part()
+
+    def close(self):
+        self._close_part()
+
+
+def read_index(directory):
+    """{relative partition path: index entry}"""
+    entries = {}
+    path = os.path.join(directory, INDEX_FILE)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    entries[entry["path"]] = entry
+    return entries
+
+
+def partitions(directory):
+    """Relative paths of all partition files, oldest day first"""
+    found = []
+    for root, _, files in os.walk(directory):
+        found.extend(os.path.relpath(os.path.join(root, name), directory)
+                     for name in files if name.endswith(".csv.gz"))
+    return sorted(found)
+
+
+def iter_rows(path):
+    """Stream the rows of one partition as dicts; stops quietly at a truncated end"""
+    with gzip.open(path, "rt", newline="", encoding="utf-8") as f:
+        try:
+            yield from csv.DictReader(f)
+        except (EOFError, zlib.error):
+            # Partition of a run that was killed mid-write
+            return
+
+
+def first_recorded_at(path):
+    """Timestamp of the first row of a partition, or None if it has no rows"""
+    for row in iter_rows(path):
+        return time.mktime(time.strptime(row["Recorded At"], RECORDED_AT_FORMAT))
+    return None
+
+
+def backfill_cutoff(directory):
+    """
+    Rows of a results store updated before this timestamp were never exported live
+    (None: nothing exported yet, every row is missing). Raises ValueError if the
+    directory was already backfilled, since a second backfill would count rows twice.
+    """
+    cutoff = None
+    for path in partitions(directory):
+        if os.path.basename(path).startswith(BACKFILL_PREFIX):
+            raise ValueError(f"{directory} was already backfilled ({path})")
+        recorded = first_recorded_at(os.path.join(directory, path))
+        if recorded is not None and (cutoff is None or recorded < cutoff):
+            cutoff = recorded
+    return cutoff
+
+
+def scan_partition(path):
+    stats = PartitionStats()
+    for row in iter_rows(path):
+        stats.add(row["Status"], row["Layout"], row["Name"], row["Headline"], row["Location"])
+    return stats
+
+
+def summarize(directory, rescan=False, run=None):
+    """Returns (PartitionStats over every partition, partitions read from the index, partitions streamed)"""
+    index = {} if rescan else read_index(directory)
+    total = PartitionStats()
+    indexed = streamed = 0
+    for path in partitions(directory):
+        entry = index.get(path)
+        if entry:
+            if run and entry["run"] != run:
+                continue
+            total.merge(PartitionStats(entry["rows"], entry["status"], entry["layout"]))
+            indexed += 1
+        else:
+            if run and not os.path.basename(path).startswith(f"{run}-"):
+                continue
+            total.merge(scan_partition(os.path.join(directory, path)))
+            streamed += 1
+    return total, indexed, streamed
+
+
+def format_summary(stats):
+    lines = [f"{stats.rows} rows"]
+    lines.append("--- Status ---")
+    for status, n in sorted(stats.status.items(), key=lambda item: -item[1]):
+        lines.append(f"{status:<30} {n:>10} {n / stats.rows:>7.1%}")
+    lines.append("--- Extraction rate by layout ---")
+    lines.append(f"{'layout':<12} {'rows':>10} " + " ".join(f"{field:>9}" for field in EXTRACTED_FIELDS))
+    for name, counts in sorted(stats.layout.items()):
+        rates = " ".join(f"{counts[field] / counts['rows']:>9.1%}" for field in EXTRACTED_FIELDS)
+        lines.append(f"{name:<12} {counts['rows']:>10} {rates}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from results_store import ResultsStore
+
+    arg_parser = argparse.ArgumentParser(description="Summarize or backfill partitioned result exports")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    summary_cmd = commands.add_parser("summary", help="Status counts and per-layout extraction rates")
+    summary_cmd.add_argument("directory", nargs="?", default=os.getenv("LINKEDIN_EXPORT_DIR", "exports"))
+    summary_cmd.add_argument("--run", help="Only partitions of this run id")
+    summary_cmd.add_argument("--rescan", action="store_true", help="Stream every partition instead of using the index")
+    summary_cmd.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    backfill_cmd = commands.add_parser("backfill", help="Export the rows of a results store as partitions")
+    backfill_cmd.add_argument("results_db")
+    backfill_cmd.add_argument("directory", nargs="?", default=os.getenv("LINKEDIN_EXPORT_DIR", "exports"))
+    backfill_cmd.add_argument("--part-rows", type=int, default=50000)
+    args = arg_parser.parse_args()
+
+    if args.command == "summary":
+        start = time.perf_counter()
+        stats, indexed, streamed = summarize(args.directory, args.rescan, args.run)
+        if args.json:
+            print(json.dumps(stats.to_dict(), indent=2))
+        elif stats.rows:
+            print(format_summary(stats))
+        else:
+            print(f"No exported rows in {args.directory}")
+        print(f"{indexed} partitions from the index, {streamed} streamed in {time.perf_counter() - start:.2f}s")
+    else:
+        # Rows exported live by process_leads are already in the partitions
+        try:
+            cutoff = backfill_cutoff(args.directory)
+        except ValueError as e:
+            arg_parser.exit(1, f"Not backfilling: {e}\n")
+        exporter = PartitionedExporter(args.directory, f"{BACKFILL_PREFIX}{time.strftime('%Y%m%d-%H%M%S')}", args.part_rows)
+        store = ResultsStore(args.results_db)
+        try:
+            for profile, status, search_url, page, updated_at in store.iter_results(before=cutoff):
+                exporter.write(profile, status, search_url, page, recorded_at=updated_at)
+        finally:
+            exporter.close()
+            store.close()
+        since = f" (recorded before {time.strftime(RECORDED_AT_FORMAT, time.localtime(cutoff))})" if cutoff else ""
+        print(f"{exporter.exported} rows exported to {args.directory}{since}")
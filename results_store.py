@@ -0,0 +1,207 @@
+"""
+Durable results store for search runs.
+
+Rows are kept in SQLite (WAL mode) keyed by profile URL and committed in
+batches, with a checkpoint of the last finished search page so an interrupted
+run resumes where it stopped instead of re-navigating and re-parsing pages.
+data.csv is exported from the store at the end of a run.
+
+The leads table is the durable queue between the two pipeline stages:
+collection enqueues every extracted profile, processing works through the
+pending ones and marks each done together with its result row. Either stage
+can run (or be re-run) on its own, also from a separate process.
+"""
+import csv
+import sqlite3
+import time
+
+from extraction import Profile
+
+CSV_HEADER = ['Name', 'Profile URL', 'Headline', 'Location', 'Status']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    url TEXT PRIMARY KEY,
+    name TEXT,
+    headline TEXT,
+    location TEXT,
+    layout TEXT,
+    status TEXT,
+    search_url TEXT,
+    page INTEGER,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    search_url TEXT PRIMARY KEY,
+    page INTEGER,
+    page_url TEXT,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS leads (
+    url TEXT PRIMARY KEY,
+    name TEXT,
+    headline TEXT,
+    location TEXT,
+    layout TEXT,
+    search_url TEXT,
+    page INTEGER,
+    state TEXT NOT NULL DEFAULT 'pending',
+    enqueued_at REAL,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS leads_by_state ON leads (state, search_url, enqueued_at);
+"""
+
+LEAD_PENDING = "pending"
+LEAD_DONE = "done"
+
+
+class ResultsStore:
+    def __init__(self, path="results.db", batch_size=25):
+        self.path = path
+        self.batch_size = batch_size
+        self.pending = 0
+        # Collection and processing may run as separate processes on the same file
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL only fsyncs at checkpoints; a crash can lose at most the open batch
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def record(self, profile, status, search_url=None, page=None):
+        """Upsert one processed profile; committed every batch_size rows"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results (url, name, headline, location, layout, status, search_url, page, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (profile.url, profile.name, profile.headline, profile.location, profile.layout,
+             status, search_url, page, time.time()),
+        )
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        self.conn.commit()
+        self.pending = 0
+
+    def get_checkpoint(self, search_url):
+        """Return (last finished page, url of the next page) or None"""
+        row = self.conn.execute(
+            "SELECT page, page_url FROM checkpoints WHERE search_url = ?", (search_url,)
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def set_checkpoint(self, search_url, page, page_url):
+        """Mark page as finished; page_url is where the next page can be loaded from"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO checkpoints (search_url, page, page_url, updated_at) VALUES (?, ?, ?, ?)",
+            (search_url, page, page_url, time.time()),
+        )
+        self.flush()
+
+    def clear_checkpoint(self, search_url):
+        self.conn.execute("DELETE FROM checkpoints WHERE search_url = ?", (search_url,))
+        self.flush()
+
+    def enqueue(self, profiles, search_url=None, page=None):
+        """
+        Queue extracted profiles (any iterable, consumed as a stream) for processing;
+        already known leads are left as they are. Returns (profiles seen, leads added).
+        """
+        now = time.time()
+        before = self.conn.total_changes
+        seen = 0
+
+        def rows():
+            nonlocal seen
+            for p in profiles:
+                seen += 1
+                yield p.url, p.name, p.headline, p.location, p.layout, search_url, page, LEAD_PENDING, now, now
+
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO leads (url, name, headline, location, layout, search_url, page, state, enqueued_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows(),
+        )
+        self.flush()
+        return seen, self.conn.total_changes - before
+
+    def pending_leads(self, search_url=None, limit=100, exclude=()):
+        """Oldest pending leads as (profile, search_url, page), leaving out the urls in exclude"""
+        query = "SELECT name, url, headline, location, layout, search_url, page FROM leads WHERE state = ?"
+        params = [LEAD_PENDING]
+        if search_url:
+            query += " AND search_url = ?"
+            params.append(search_url)
+        if exclude:
+            query += f" AND url NOT IN ({', '.join('?' * len(exclude))})"
+            params.extend(exclude)
+        query += " ORDER BY enqueued_at, page LIMIT ?"
+        params.append(limit)
+        return [(Profile(name=name, url=url, headline=headline, location=location, layout=layout), lead_search, page)
+                for name, url, headline, location, layout, lead_search, page in self.conn.execute(query, params)]
+
+    def finish_lead(self, url):
+        """Mark a lead processed; committed with the result row recorded for it"""
+        self.conn.execute("UPDATE leads SET state = ?, updated_at = ? WHERE url = ?", (LEAD_DONE, time.time(), url))
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.flush()
+
+    def requeue(self, search_url=None):
+        """Put processed leads back in the queue so processing can be re-run. Returns the count"""
+        query = "UPDATE leads SET state = ?, updated_at = ? WHERE state = ?"
+        params = [LEAD_PENDING, time.time(), LEAD_DONE]
+        if search_url:
+            query += " AND search_url = ?"
+            params.append(search_url)
+        count = self.conn.execute(query, params).rowcount
+        self.flush()
+        return count
+
+    def lead_counts(self, search_url=None):
+        """{state: count} of queued leads"""
+        query = "SELECT state, COUNT(*) FROM leads"
+        params = ()
+        if search_url:
+            query += " WHERE search_url = ?"
+            params = (search_url,)
+        return dict(self.conn.execute(query + " GROUP BY state", params).fetchall())
+
+    def export_csv(self, output_file, search_url=None):
+        """Write stored rows (optionally only one search) to a CSV file"""
+        self.flush()
+        query = "SELECT name, url, headline, location, status FROM results"
+        params = ()
+        if search_url:
+            query += " WHERE search_url = ?"
+            params = (search_url,)
+        query += " ORDER BY page, updated_at"
+
+        count = 0
+        with open(output_file, mode='w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            for row in self.conn.execute(query, params):
+                writer.writerow(row)
+                count += 1
+        return count
+
+    def iter_results(self, before=None):
+        """Stream stored rows (optionally only those last updated before a timestamp) as
+        (profile, status, search_url, page, updated_at), oldest first"""
+        self.flush()
+        query = "SELECT name, url, headline, location, layout, status, search_url, page, updated_at FROM results"
+        params = ()
+        if before is not None:
+            query += " WHERE updated_at < ?"
+            params = (before,)
+        rows = self.conn.execute(query + " ORDER BY updated_at", params)
+        for name, url, headline, location, layout, status, search_url, page, updated_at in rows:
+            profile = Profile(name=name, url=url, headline=headline, location=location, layout=layout)
+            yield profile, status, search_url, page, updated_at
+
+    def close(self):
+        self.flush()
+        self.conn.close()
@@ -0,0 +1,113 @@
+"""
+Named Selenium selectors, per UI layout.
+
+Every locator the bot uses lives here instead of being scattered through
+linkedin_bot.py. LAYOUT_SELECTORS overrides COMMON_SELECTORS for one layout
+(new SDUI, classic standard, Sales Navigator). XPath expressions are compiled
+once at import (with lxml) so a typo fails at startup, not mid-run.
+
+SelectorRegistry remembers the layout detected on the first search page, so
+later pages only check that layout's selectors instead of the whole waterfall.
+"""
+from selenium.webdriver.common.by import By
+
+from bot_logging import get_logger
+from extraction import HAS_LXML, LAYOUT_CLASSIC, LAYOUT_GENERIC, LAYOUT_ORDER, LAYOUT_SALES_NAV, LAYOUT_SDUI
+
+log = get_logger("selectors")
+
+COMMON_SELECTORS = {
+    # Session
+    "global_nav": (By.ID, "global-nav"),
+    "login_username": (By.ID, "username"),
+    "login_password": (By.ID, "password"),
+    "profile_name": (By.TAG_NAME, "h1"),
+
+    # Profile actions
+    "connect_button": (By.XPATH, "//button[span[text()='Connect']]"),
+    "more_actions": (By.XPATH, "//button[contains(@aria-label, 'More actions')]"),
+    "dropdown_connect": (By.XPATH, "//div[contains(@class, 'artdeco-dropdown')]//div[span[text()='Connect']]"),
+    "dropdown_message": (By.XPATH, "//div[contains(@class, 'artdeco-dropdown')]//div[span[text()='Message']]"),
+    "message_button": (By.XPATH, "//button[span[text()='Message']]"),
+    "message_button_any": (By.XPATH, "//button[contains(., 'Message')]"),
+
+    # Connect modal
+    "modal": (By.XPATH, "//div[@role='dialog'] | //div[contains(@class, 'artdeco-modal')] | //div[contains(@class, 'msg-overlay-conversation-bubble')]"),
+    "modal_header": (By.XPATH, "//h2[contains(@class, 'artdeco-modal__header')]"),
+    "add_note_button": (By.XPATH, "//button[span[text()='Add a note']]"),
+    "note_textarea": (By.ID, "custom-message"),
+    "modal_send": (By.XPATH, "//button[span[text()='Send']]"),
+    "modal_send_without_note": (By.XPATH, "//button[span[text()='Send without a note']]"),
+    "modal_dismiss": (By.XPATH, "//button[contains(@class, 'artdeco-modal__dismiss')]"),
+
+    # Chat overlay / InMail composer
+    "chat_textbox": (By.XPATH, "//div[@role='textbox' and @contenteditable='true']"),
+    "chat_send": (By.XPATH, "//button[text()='Send']"),
+    "chat_close": (By.XPATH, "//button[contains(@class, 'msg-overlay-bubble-header__control--close-btn')]"),
+    "composer_subject": (By.XPATH, "//input[@name='subject']"),
+    "composer_body": (By.XPATH, "//div[@role='textbox' and @contenteditable='true'] | //textarea[@name='message']"),
+    "composer_send": (By.XPATH, "//button[text()='Send' or span[text()='Send']]"),
+    "composer_close": (By.XPATH, "//button[contains(@class, 'msg-overlay-bubble-header__control--close-btn') or contains(@class, 'artdeco-modal__dismiss')]"),
+
+    # Search results
+    "next_page": (By.XPATH, "//button[@aria-label='Next']"),
+}
+
+LAYOUT_SELECTORS = {
+    LAYOUT_SDUI: {
+        "results_ready": (By.CSS_SELECTOR, "[data-view-name='search-result-lockup-title']"),
+    },
+    LAYOUT_CLASSIC: {
+        # Standard internal profile links
+        "results_ready": (By.XPATH, "//a[contains(@href, '/in/') and not(contains(@href, 'linkedin.com/in/'))]"),
+    },
+    LAYOUT_SALES_NAV: {
+        "results_ready": (By.XPATH, "//a[contains(@href, '/sales/people') or contains(@href, '/sales/lead/')]"),
+        "next_page": (By.XPATH, "//button[contains(@class, 'search-results__pagination-next-button')]"),
+    },
+}
+
+
+def _compile_xpaths():
+    """Fail fast on malformed XPath (lxml implements the same XPath 1.0 as browsers)"""
+    if not HAS_LXML:
+        return
+    from lxml import etree
+    tables = [COMMON_SELECTORS] + list(LAYOUT_SELECTORS.values())
+    for table in tables:
+        for name, (by, value) in table.items():
+            if by == By.XPATH:
+                try:
+                    etree.XPath(value)
+                except etree.XPathSyntaxError as e:
+                    raise ValueError(f"Invalid XPath for selector '{name}': {value} ({e})")
+
+
+_compile_xpaths()
+
+
+class SelectorRegistry:
+    def __init__(self, layout=None):
+        self.layout = layout
+
+    def remember_layout(self, layout):
+        """Cache the detected search layout for the rest of the run"""
+        if layout and layout != LAYOUT_GENERIC and layout != self.layout:
+            log.info("Search layout detected: %s", layout)
+            self.layout = layout
+
+    def get(self, name, layout=None):
+        """Locator tuple for name, preferring the given (or remembered) layout's override"""
+        layout = layout or self.layout
+        override = LAYOUT_SELECTORS.get(layout, {}).get(name)
+        return override or COMMON_SELECTORS[name]
+
+    def candidates(self, name):
+        """
+        {layout: locator} to try for a per-layout selector: only the remembered
+        layout once known, otherwise every layout in waterfall order.
+        """
+        if self.layout in LAYOUT_SELECTORS and name in LAYOUT_SELECTORS[self.layout]:
+            return {self.layout: LAYOUT_SELECTORS[self.layout][name]}
+        return {layout: LAYOUT_SELECTORS[layout][name] for layout in LAYOUT_ORDER
+                if name in LAYOUT_SELECTORS.get(layout, {})}
@@ -0,0 +1,96 @@
+"""
+Saved LinkedIn session (cookies) as JSON.
+
+Replaces the pickled cookies.pkl: JSON cannot execute code when loaded, the
+file is written atomically and readable by the owner only, and expired cookies
+are dropped on save. Whether the session is usable is decided locally before
+the browser is touched: no file, no li_at auth cookie or an expired one means
+the bot goes straight to the credential login.
+
+Cookies are installed with one CDP call before the first navigation, so a
+restore costs a single feed load instead of homepage + add_cookie per cookie +
+refresh.
+"""
+import json
+import os
+import time
+
+AUTH_COOKIE = "li_at"
+# Treat cookies expiring within this many seconds as already expired
+EXPIRY_MARGIN = 60
+VERSION = 1
+
+
+def is_expired(cookie, now=None):
+    expiry = cookie.get("expiry")
+    if expiry is None:
+        return False  # Session cookie: valid as long as the session is
+    return expiry <= (now or time.time()) + EXPIRY_MARGIN
+
+
+class SessionStore:
+    def __init__(self, path="session.json"):
+        self.path = path
+
+    def save(self, cookies):
+        """Write unexpired cookies atomically (owner read/write only); returns how many were kept"""
+        now = time.time()
+        kept = []
+        for cookie in cookies:
+            cookie = dict(cookie)
+            if "expiry" in cookie:
+                try:
+                    cookie["expiry"] = int(cookie["expiry"])
+                except (TypeError, ValueError):
+                    del cookie["expiry"]
+            if not is_expired(cookie, now):
+                kept.append(cookie)
+        tmp = self.path + ".tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": VERSION, "saved_at": now, "cookies": kept}, f)
+        os.replace(tmp, self.path)
+        return len(kept)
+
+    def load(self):
+        """
+        Returns (cookies, None) for a usable session, or (None, reason) without
+        reading anything else: missing file, unreadable file, no or expired auth cookie.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None, "no saved session"
+        except (OSError, ValueError) as e:
+            return None, f"unreadable session file ({e})"
+        if not isinstance(data, dict) or data.get("version") != VERSION:
+            return None, "unknown session file format"
+
+        now = time.time()
+        cookies = [c for c in data.get("cookies", []) if not is_expired(c, now)]
+        auth = next((c for c in cookies if c.get("name") == AUTH_COOKIE), None)
+        if auth is None:
+            return None, f"{AUTH_COOKIE} cookie missing or expired"
+        return cookies, None
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def cdp_cookie(cookie):
+    """Selenium cookie dict -> Network.setCookies entry"""
+    entry = {
+        "name": cookie["name"],
+        "value": cookie["value"],
+        "domain": cookie.get("domain", ".linkedin.com"),
+        "path": cookie.get("path", "/"),
+        "secure": cookie.get("secure", False),
+        "httpOnly": cookie.get("httpOnly", False),
+    }
+    if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+        entry["sameSite"] = cookie["sameSite"]
+    if "expiry" in cookie:
+        entry["expires"] = cookie["expiry"]
+    return entry
@@ -0,0 +1,22 @@
+import pytest
+
+from dedup import open_seen_index
+
+URL = "https://www.linkedin.com/in/someone/"
+
+
+@pytest.mark.parametrize("mode", ["set", "bloom"])
+def test_added_url_is_seen_after_reopen(tmp_path, mode):
+    base = str(tmp_path / "seen")
+    seen = open_seen_index(base, mode)
+    assert seen is not None
+    assert not seen.contains(URL)
+    seen.add(URL)
+    seen.flush()
+    seen.close()
+
+    reopened = open_seen_index(base, mode)
+    # Same profile with a query string and different case
+    assert reopened.contains("https://www.LinkedIn.com/in/someone?miniProfileUrn=x")
+    assert not reopened.contains("https://www.linkedin.com/in/someone-else/")
+    reopened.close()
@@ -0,0 +1,57 @@
+import pytest
+
+from failures import CAPTCHA, NOT_FOUND, RATE_LIMITED, SESSION_EXPIRED, classify_page
+
+PROFILE_NAME = ("tag name", "h1")
+
+
+class StubDriver:
+    """Answers CLASSIFY_SCRIPT like a page with this url/title/body would"""
+
+    def __init__(self, url, title="Jane Doe | LinkedIn", body="", captcha=False, has_expected=True):
+        self.result = [url, title, captcha, body]
+        self.has_expected = has_expected
+
+    def execute_script(self, script, expected):
+        url, title, captcha, body = self.result
+        # The script only reads the body text when the expected element is missing
+        return [url, title, captcha, None if expected and self.has_expected else body]
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.linkedin.com/in/loginova-anna/",
+    "https://www.linkedin.com/in/captcha-smith/",
+    "https://www.linkedin.com/in/signupster/?trk=404",
+])
+def test_profile_urls_with_marker_words_are_normal(url):
+    assert classify_page(StubDriver(url), PROFILE_NAME) is None
+
+
+def test_profile_text_is_not_scanned_when_the_name_is_there():
+    driver = StubDriver("https://www.linkedin.com/in/jane/", title="(429) Jane Doe | LinkedIn",
+                        body="Helping teams recover from unusual activity. Page not found? Try again later.")
+    assert classify_page(driver, PROFILE_NAME) is None
+
+
+@pytest.mark.parametrize("url, kind", [
+    ("https://www.linkedin.com/login?session_redirect=%2Ffeed%2F", SESSION_EXPIRED),
+    ("https://www.linkedin.com/authwall?trk=bf", SESSION_EXPIRED),
+    ("https://www.linkedin.com/uas/login", SESSION_EXPIRED),
+    ("https://www.linkedin.com/checkpoint/challenge/AgF123", CAPTCHA),
+    ("https://www.linkedin.com/404/", NOT_FOUND),
+    ("https://www.linkedin.com/in/unavailable/", NOT_FOUND),
+])
+def test_interstitial_urls(url, kind):
+    assert classify_page(StubDriver(url), PROFILE_NAME) == kind
+
+
+def test_text_is_checked_when_the_expected_element_is_missing():
+    driver = StubDriver("https://www.linkedin.com/in/jane/", title="LinkedIn",
+                        body="Too many requests. Please try again later.", has_expected=False)
+    assert classify_page(driver, PROFILE_NAME) == RATE_LIMITED
+    assert classify_page(StubDriver("https://www.linkedin.com/in/x/", title="429 Too Many Requests",
+                                    has_expected=False), PROFILE_NAME) == RATE_LIMITED
+
+
+def test_captcha_dom_marker():
+    assert classify_page(StubDriver("https://www.linkedin.com/in/jane/", captcha=True), PROFILE_NAME) == CAPTCHA
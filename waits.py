@@ -0,0 +1,167 @@
+"""
+Smart waits for the browser hot path.
+
+Waiter returns as soon as the awaited condition holds (page loaded, element
+present, modal rendered, network quiet) instead of sleeping a fixed 3-5s.
+Human-like pacing is a separate PacingPolicy: each wait can carry a minimum
+floor, and only the part of the floor not already spent waiting is slept.
+
+Search results readiness is a single async script: a MutationObserver checks
+every layout's locator inside the page and resolves with the layout that
+matched, instead of one find_elements round-trip per locator per poll.
+"""
+import random
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from selector_registry import COMMON_SELECTORS
+
+
+class PacingPolicy:
+    """
+    Minimum delay between browser actions, tuned separately from readiness waits.
+    scale multiplies every floor (LINKEDIN_PACING_SCALE); 0 disables pacing.
+    """
+    def __init__(self, scale=1.0):
+        self.scale = scale
+
+    def floor(self, min_seconds, max_seconds):
+        return random.uniform(min_seconds, max_seconds) * self.scale
+
+    def pause(self, min_seconds, max_seconds=None, since=None):
+        """Sleep a random floor, minus the time already elapsed since `since` (monotonic)"""
+        delay = self.floor(min_seconds, max_seconds if max_seconds is not None else min_seconds)
+        if since is not None:
+            delay -= time.monotonic() - since
+        if delay > 0:
+            time.sleep(delay)
+
+
+def document_ready(driver):
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+def any_element_present(*locators):
+    """Condition: first element matching any of the locators"""
+    def condition(driver):
+        for by, value in locators:
+            elements = driver.find_elements(by, value)
+            if elements:
+                return elements[0]
+        return False
+    return condition
+
+
+# arguments: [[layout, by, value], ...], timeout ms, async callback.
+# Resolves with the first layout whose locator matches, or null on timeout.
+READY_SCRIPT = """
+const [probes, timeoutMs] = arguments;
+const done = arguments[arguments.length - 1];
+function match() {
+    for (const [layout, by, value] of probes) {
+        const node = by === 'xpath'
+            ? document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+            : document.querySelector(value);
+        if (node) return layout;
+    }
+    return null;
+}
+const first = match();
+if (first) return done(first);
+
+// Coalesce bursts of mutations into at most one check every 50ms
+let timer = null, pending = false;
+const finish = layout => { observer.disconnect(); clearTimeout(timer); done(layout); };
+const observer = new MutationObserver(() => {
+    if (pending) return;
+    pending = true;
+    setTimeout(() => {
+        pending = false;
+        const layout = match();
+        if (layout) finish(layout);
+    }, 50);
+});
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+timer = setTimeout(() => finish(match()), timeoutMs);
+"""
+READY_LOCATOR_TYPES = (By.XPATH, By.CSS_SELECTOR)
+
+
+class NetworkIdle:
+    """Condition: page loaded and no new resource entries for `quiet` seconds"""
+    SCRIPT = "return [document.readyState, performance.getEntriesByType('resource').length]"
+
+    def __init__(self, quiet=0.5):
+        self.quiet = quiet
+        self.last_count = None
+        self.last_change = time.monotonic()
+
+    def __call__(self, driver):
+        state, count = driver.execute_script(self.SCRIPT)
+        now = time.monotonic()
+        if count != self.last_count:
+            self.last_count = count
+            self.last_change = now
+            return False
+        return state == "complete" and now - self.last_change >= self.quiet
+
+
+class Waiter:
+    def __init__(self, driver, pacing=None, timeout=15, poll=0.2):
+        self.driver = driver
+        self.pacing = pacing or PacingPolicy()
+        self.timeout = timeout
+        self.poll = poll
+
+    def until(self, condition, timeout=None, floor=None):
+        """
+        Wait until condition(driver) is truthy, then apply the pacing floor (min, max).
+        Returns the condition's value, or None on timeout.
+        """
+        start = time.monotonic()
+        try:
+            result = WebDriverWait(self.driver, timeout or self.timeout, poll_frequency=self.poll).until(condition)
+        except (TimeoutException, WebDriverException):
+            result = None
+        if floor:
+            self.pacing.pause(*floor, since=start)
+        return result
+
+    def page_ready(self, timeout=None, floor=(0.5, 1.5)):
+        return self.until(document_ready, timeout, floor)
+
+    def element(self, *locators, timeout=None, floor=None):
+        return self.until(any_element_present(*locators), timeout, floor)
+
+    def modal(self, timeout=None, floor=(0.5, 1)):
+        # Dialogs used for InMail, Sales Nav messaging and the connect modal
+        return self.until(any_element_present(COMMON_SELECTORS["modal"]), timeout, floor)
+
+    def network_idle(self, quiet=0.5, timeout=None, floor=(0.5, 1.5)):
+        return self.until(NetworkIdle(quiet), timeout, floor)
+
+    def first_ready(self, locators, timeout=None, floor=None):
+        """
+        Wait in one browser-side call until any of {layout: locator} matches.
+        Returns the layout that became ready, or None on timeout.
+        """
+        timeout = timeout or self.timeout
+        probes = []
+        for layout, (by, value) in locators.items():
+            if by not in READY_LOCATOR_TYPES:
+                raise ValueError(f"Readiness probe for '{layout}' must be XPath or CSS, got {by}")
+            probes.append([layout, by, value])
+
+        start = time.monotonic()
+        try:
+            # The page resolves the promise itself; keep the driver from giving up first
+            self.driver.set_script_timeout(timeout + 5)
+            layout = self.driver.execute_async_script(READY_SCRIPT, probes, int(timeout * 1000))
+        except WebDriverException:
+            layout = None
+        if floor:
+            self.pacing.pause(*floor, since=start)
+        return layout